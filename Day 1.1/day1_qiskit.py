@@ -1,17 +1,29 @@
+import sys
 from pathlib import Path
-from typing import Dict, Tuple
+from typing import Dict, Optional, Tuple
 
 import numpy as np
 
 from qiskit import QuantumCircuit
+from qiskit.circuit.library import UnitaryGate
 from qiskit.quantum_info import Statevector, Operator
 
+# Shared helpers live in <repo>/common
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from common.dial_ops import (  # noqa: E402
+    compress_rotations,
+    inverse_permutation,
+    make_rotation_unitary,
+    rotation_permutation,
+)
+from common.modular_adder import build_modular_dial_circuit  # noqa: E402
+
 
 NUM_STATES = 100      # dial values 0..99
 NUM_QUBITS = 7        # 2^7 = 128 >= 100
 
 
-def parse_rotations(text: str):
+def parse_rotations(text: str, num_states: int = NUM_STATES):
     rotations = []
     for raw_line in text.splitlines():
         line = raw_line.strip()
@@ -19,69 +31,118 @@ def parse_rotations(text: str):
             continue
         direction = line[0]
         dist = int(line[1:])
-        rotations.append((direction, dist % NUM_STATES))
+        rotations.append((direction, dist % num_states))
     return rotations
 
 
-def make_rotation_unitary(direction: str, dist: int) -> Operator:
-    """
-    Build a 2^7 x 2^7 permutation unitary representing a single rotation:
-      - For states 0..99: add/subtract dist modulo 100
-      - For states 100..127: leave unchanged
+def build_quantum_dial_circuit(
+    rotations,
+    compress: bool = False,
+    window: Optional[int] = None,
+    gate_level: bool = False,
+    num_states: int = NUM_STATES,
+) -> Tuple[QuantumCircuit, Dict[Tuple[str, int], Operator]]:
     """
-    dim = 2**NUM_QUBITS
-    mat = np.zeros((dim, dim), dtype=complex)
-
-    for basis in range(dim):
-        if basis < NUM_STATES:
-            if direction == "R":
-                new_basis = (basis + dist) % NUM_STATES
-            elif direction == "L":
-                new_basis = (basis - dist) % NUM_STATES
-            else:
-                raise ValueError(f"Invalid direction {direction!r}")
-        else:
-            # unused states: act as identity
-            new_basis = basis
+    Build a QuantumCircuit with 7 qubits where each rotation is a big unitary gate.
+    Also return a cache of Operators so we can reuse them with Statevector.
 
-        mat[new_basis, basis] = 1.0
+    With compress=True, runs of rotations are first merged by compress_rotations,
+    so the circuit only has one gate per hit at 0 (or per `window` rotations).
 
-    return Operator(mat)
+    gate_level=True builds the modular-adder circuit of common/modular_adder.py
+    instead (start |50>, dial measured; the Operator cache is empty). Only that
+    circuit works for a dial size other than 100; parse the rotations with
+    the same num_states.
+    """
+    if compress:
+        rotations = compress_rotations(rotations, window=window, num_states=num_states)
 
+    if gate_level:
+        return build_modular_dial_circuit(rotations, num_states=num_states), {}
+    if num_states != NUM_STATES:
+        raise ValueError(f"Dense rotation gates need a {NUM_STATES}-position dial, use gate_level=True")
 
-def build_quantum_dial_circuit(rotations) -> Tuple[QuantumCircuit, Dict[Tuple[str, int], Operator]]:
-    """
-    Build a QuantumCircuit with 7 qubits where each rotation is a big unitary gate.
-    Also return a cache of Operators so we can reuse them with Statevector.
-    """
     qc = QuantumCircuit(NUM_QUBITS, name="dial")
     cache: Dict[Tuple[str, int], Operator] = {}
+    gates: Dict[Tuple[str, int], UnitaryGate] = {}
 
     for direction, dist in rotations:
         key = (direction, dist)
-        if key not in cache:
+        if key not in gates:
             cache[key] = make_rotation_unitary(direction, dist)
-        op = cache[key]
-        qc.unitary(op, qc.qubits, label=f"{direction}{dist}")
+            # one validated gate per key, appended as the same instance every time
+            gates[key] = UnitaryGate(cache[key], label=f"{direction}{dist}")
+        qc.append(gates[key], qc.qubits)
 
     return qc, cache
 
 
-def solve_quantum(text: str) -> int:
+def evolve_permutation(rotations, state: Statevector) -> int:
+    """
+    Evolve `state` through the rotations using index arrays instead of dense
+    Operators, and count how many steps leave the dial at 0.
+
+    - Basis state: only the basis index is tracked, O(1) per step.
+    - Superposition: the amplitude vector is permuted with an index gather,
+      O(dim) per step instead of a dense O(dim^2) matrix-vector product.
+    """
+    data = np.asarray(state.data)
+    support = np.flatnonzero(data)
+    hits = 0
+
+    if support.size == 1:
+        idx = int(support[0])
+        for key in rotations:
+            idx = int(rotation_permutation(*key)[idx])
+            if idx == 0:
+                hits += 1
+        return hits
+
+    for key in rotations:
+        data = data[inverse_permutation(*key)]
+        probs = np.abs(data) ** 2
+        if int(np.argmax(probs)) == 0:
+            hits += 1
+    return hits
+
+
+def solve_quantum(
+    text: str,
+    engine: str = "permutation",
+    compress: Optional[bool] = None,
+    window: Optional[int] = None,
+) -> int:
     """
     Use quantum state evolution to count how many times the dial is at 0.
+
+    engine="permutation" evolves with index arrays (see evolve_permutation);
+    engine="dense" applies the 128x128 Operators with Statevector.evolve.
+    compress/window are passed to build_quantum_dial_circuit for the returned
+    circuit. compress=None compresses for the permutation engine, which never
+    touches the dense gates, so it does not pay for one unitary per line.
     """
+    if engine not in ("permutation", "dense"):
+        raise ValueError(f"Invalid engine {engine!r}")
+    if compress is None:
+        compress = engine == "permutation"
+
     rotations = parse_rotations(text)
-    qc, op_cache = build_quantum_dial_circuit(rotations)
+    qc, op_cache = build_quantum_dial_circuit(rotations, compress=compress, window=window)
 
     # Start in |50> (dial initially at 50)
     state = Statevector.from_int(50, 2**NUM_QUBITS)
+
+    if engine == "permutation":
+        return evolve_permutation(rotations, state), qc
+
     hits = 0
 
     # Evolve step by step
     for direction, dist in rotations:
-        op = op_cache[(direction, dist)]
-        state = state.evolve(op)
+        key = (direction, dist)
+        if key not in op_cache:
+            op_cache[key] = make_rotation_unitary(direction, dist)
+        state = state.evolve(op_cache[key])
 
         # Because our unitaries are permutations, the state is always a basis state.
         # Find which basis vector has probability 1:
@@ -94,6 +155,35 @@ def solve_quantum(text: str) -> int:
     return hits, qc
 
 
+def solve_all_starts(text: str, engine: str = "permutation") -> np.ndarray:
+    """
+    Count hits at 0 for every starting dial position in a single pass.
+
+    Returns a 100-entry array where entry s is the hit count when starting at |s>.
+    engine="permutation" moves all 100 basis indices through the cached index
+    arrays at once; engine="dense" evolves a 128x100 matrix whose columns are
+    the 100 start states through the shared Operators.
+    """
+    rotations = parse_rotations(text)
+    hits = np.zeros(NUM_STATES, dtype=np.int64)
+
+    if engine == "permutation":
+        positions = np.arange(NUM_STATES)
+        for key in rotations:
+            positions = rotation_permutation(*key)[positions]
+            hits += positions == 0
+        return hits
+    if engine != "dense":
+        raise ValueError(f"Invalid engine {engine!r}")
+
+    states = np.eye(2**NUM_QUBITS, NUM_STATES, dtype=complex)
+    for key in rotations:
+        states = make_rotation_unitary(*key).data @ states
+        probs = np.abs(states) ** 2
+        hits += np.argmax(probs, axis=0) == 0
+    return hits
+
+
 def main():
     text = Path("input.txt").read_text()
 
@@ -101,7 +191,7 @@ def main():
 
     print(f"Quantum-simulated hits at 0: {hits}")
 
-    # Show the circuit (lots of big unitary boxes)
+    # Show the circuit (one unitary box per hit at 0, see compress_rotations)
     print("\nQuantum dial circuit:")
     print(qc.draw(output="text"))
 
@@ -1,10 +1,21 @@
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import accumulate
 from pathlib import Path
+import os
+import random
+import sys
 import time
 import numpy as np
 
 from qiskit import QuantumCircuit
-from qiskit.quantum_info import Operator
-from qiskit_aer import AerSimulator
+from qiskit.circuit.library import UnitaryGate
+
+# Shared helpers live in <repo>/common
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from common.dial_ops import compress_rotations, make_rotation_unitary  # noqa: E402
+from common.execution import run_counts  # noqa: E402
+from common.modular_adder import build_modular_dial_circuit  # noqa: E402
 
 
 NUM_STATES = 100
@@ -56,48 +67,402 @@ def solve_classical(text: str) -> int:
     return hits
 
 
-def parse_rotations(text: str):
+_DIRECTION_TO_SPACE = str.maketrans("RL", "  ")
+_ROTATION_BYTES = np.frombuffer(b"RL0123456789- \t\r\n", dtype=np.uint8)
+_WHITESPACE_BYTES = np.frombuffer(b" \t\r\n", dtype=np.uint8)
+_DIGIT_BYTES = np.frombuffer(b"0123456789", dtype=np.uint8)
+_DISTANCE_START_BYTES = np.frombuffer(b"0123456789-", dtype=np.uint8)
+
+
+def parse_rotations_array(text: str) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Parse the rotation log into NumPy arrays without a Python loop per line:
+      is_right[i] = True for "R", False for "L"
+      dists[i]    = full (un-reduced) distance
+    """
+    buf = np.frombuffer(text.encode("ascii", errors="replace"), dtype=np.uint8)
+    bad = ~np.isin(buf, _ROTATION_BYTES)
+    if bad.any():
+        raise ValueError(f"Invalid direction: {chr(buf[np.argmax(bad)])!r}")
+
+    is_letter = (buf == ord("R")) | (buf == ord("L"))
+    letters = buf[is_letter]
+    if letters.size == 0 and not text.strip():
+        return np.zeros(0, dtype=bool), np.zeros(0, dtype=np.int64)
+
+    # Same shape as solve_classical's "<R|L><int>" per non-blank line: the
+    # first character of every line is the only direction letter, a digit or
+    # "-" follows it directly, and "-" only appears as the distance's sign.
+    line_no = np.cumsum((buf == ord("\n")) | (buf == ord("\r")))
+    filled = np.flatnonzero(~np.isin(buf, _WHITESPACE_BYTES))
+    filled_lines = line_no[filled]
+    firsts = filled[np.concatenate(([True], filled_lines[1:] != filled_lines[:-1]))]
+    if firsts.size != letters.size or not is_letter[firsts].all():
+        raise ValueError("Every non-blank line needs exactly one leading direction R or L")
+
+    following = np.append(buf, 0)[np.flatnonzero(is_letter) + 1]
+    if not np.isin(following, _DISTANCE_START_BYTES).all():
+        raise ValueError("Every direction must be followed directly by its distance")
+    minus = np.flatnonzero(buf == ord("-"))
+    if not (is_letter[minus - 1].all() and np.isin(np.append(buf, 0)[minus + 1], _DIGIT_BYTES).all()):
+        raise ValueError("A '-' must sit between a direction and its digits")
+
+    is_right = letters == ord("R")
+    dists = np.fromstring(text.translate(_DIRECTION_TO_SPACE), dtype=np.int64, sep=" ")
+    if dists.size != is_right.size:
+        raise ValueError("Every rotation needs exactly one direction and one distance")
+    return is_right, dists
+
+
+def zeros_on_moves(starts, is_right, dists) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized zeros_on_move: same rules (including delta == 0 -> 100 and
+    dist <= 0 -> no move), evaluated element-wise with NumPy broadcasting.
+    """
+    s = starts % 100
+    delta = np.where(is_right, (100 - s) % 100, s)
+    delta = np.where(delta == 0, 100, delta)
+
+    moving = dists > 0
+    hits = np.where(moving & (dists >= delta), 1 + (dists - delta) // 100, 0)
+    step = np.where(moving, np.where(is_right, dists, -dists), 0)
+    new_pos = (starts + step) % 100
+    return new_pos, hits
+
+
+def solve_numpy(text: str, start: int = 50) -> int:
+    """
+    Same answer as solve_classical without a Python loop over the moves:
+    positions come from a signed cumulative sum, hits from zeros_on_moves.
+    """
+    is_right, dists = parse_rotations_array(text)
+    if dists.size == 0:
+        return 0
+
+    steps = np.where(dists > 0, np.where(is_right, dists, -dists), 0) % 100
+    ends = (start + np.cumsum(steps)) % 100
+    starts = np.concatenate(([start % 100], ends[:-1]))
+
+    _, hits = zeros_on_moves(starts, is_right, dists)
+    return int(hits.sum())
+
+
+def transition_table(is_right, dists) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Compose a run of moves into one table over all 100 start positions:
+      end[s]  = dial position after the run when starting at s
+      hits[s] = zeros crossed during the run when starting at s
+
+    in O(moves + 100). With the dial at p before a move of dist = 100q + r,
+    zeros_on_move counts q + 1 if p lies in [100 - r, 99] (R) or [1, r] (L),
+    else q. p is the start shifted by the run's prefix offset, so each move
+    adds q everywhere plus 1 on one cyclic interval of starts, which a
+    difference array over two laps of the dial accumulates for all moves.
+    """
+    is_right = np.asarray(is_right, dtype=bool)
+    dists = np.asarray(dists, dtype=np.int64)
+    moving = dists > 0
+
+    steps = np.where(moving, np.where(is_right, dists, -dists), 0) % 100
+    offsets = np.concatenate(([0], np.cumsum(steps)[:-1])) % 100
+    end = (np.arange(100, dtype=np.int64) + int(steps.sum())) % 100
+
+    full_turns = int(np.where(moving, dists // 100, 0).sum())
+    r = np.where(moving, dists % 100, 0)
+    lo = np.where(is_right, 100 - r, 1)
+    first = (lo - offsets) % 100
+
+    diff = np.bincount(first, minlength=201) - np.bincount(first + r, minlength=201)
+    laps = np.cumsum(diff[:200])
+    hits = full_turns + laps[:100] + laps[100:]
+    return end, hits.astype(np.int64)
+
+
+def compose_tables(first, second) -> tuple[np.ndarray, np.ndarray]:
+    """Table for running `first` and then `second` (the composition is associative)."""
+    end1, hits1 = first
+    end2, hits2 = second
+    return end2[end1], hits1 + hits2[end1]
+
+
+def prefix_scan_tables(tables) -> list[tuple[np.ndarray, np.ndarray]]:
+    """Inclusive prefix scan: entry i is the composed table of chunks 0..i."""
+    return list(accumulate(tables, compose_tables))
+
+
+def solve_all_starts(text: str) -> np.ndarray:
+    """
+    Hit counts for every possible starting dial value in one pass over the
+    input: entry s is what solve_classical would return if pos started at s.
+    """
+    is_right, dists = parse_rotations_array(text)
+    _, hits = transition_table(is_right, dists)
+    return hits
+
+
+def solve_parallel(text: str, workers: int | None = None, start: int = 50) -> int:
+    """
+    Split the moves into chunks, build every chunk's transition table in a
+    process pool, then combine the tables with a prefix scan. Exact, and the
+    Python counterpart of the Rayon parallelism in the Rust crate.
+    """
+    is_right, dists = parse_rotations_array(text)
+    if dists.size == 0:
+        return 0
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    num_chunks = min(len(dists), 4 * workers)
+    right_chunks = np.array_split(is_right, num_chunks)
+    dist_chunks = np.array_split(dists, num_chunks)
+
+    if workers == 1:
+        tables = list(map(transition_table, right_chunks, dist_chunks))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            tables = list(pool.map(transition_table, right_chunks, dist_chunks))
+
+    _, hits = prefix_scan_tables(tables)[-1]
+    return int(hits[start % 100])
+
+
+def identity_table() -> tuple[np.ndarray, np.ndarray]:
+    return np.arange(100, dtype=np.int64), np.zeros(100, dtype=np.int64)
+
+
+def move_table(direction: str, dist: int) -> tuple[np.ndarray, np.ndarray]:
+    """Transition table of a single move, i.e. zeros_on_move for all 100 starts."""
+    if direction not in ("R", "L"):
+        raise ValueError(f"Invalid direction: {direction!r}")
+    return zeros_on_moves(np.arange(100, dtype=np.int64), direction == "R", np.int64(dist))
+
+
+class _LogNode:
+    __slots__ = ("move", "table", "agg", "size", "prio", "left", "right")
+
+    def __init__(self, move, table, prio):
+        self.move = move
+        self.table = table
+        self.agg = table
+        self.size = 1
+        self.prio = prio
+        self.left = None
+        self.right = None
+
+
+def _size(node) -> int:
+    return node.size if node is not None else 0
+
+
+def _pull(node) -> None:
+    """Recompute size and composed table of `node` from its children."""
+    agg = node.table
+    if node.left is not None:
+        agg = compose_tables(node.left.agg, agg)
+    if node.right is not None:
+        agg = compose_tables(agg, node.right.agg)
+    node.agg = agg
+    node.size = 1 + _size(node.left) + _size(node.right)
+
+
+def _split(node, k):
+    """Split into (first k moves, rest)."""
+    if node is None:
+        return None, None
+    if _size(node.left) >= k:
+        left, node.left = _split(node.left, k)
+        _pull(node)
+        return left, node
+    node.right, right = _split(node.right, k - _size(node.left) - 1)
+    _pull(node)
+    return node, right
+
+
+def _merge(a, b):
+    if a is None:
+        return b
+    if b is None:
+        return a
+    if a.prio > b.prio:
+        a.right = _merge(a.right, b)
+        _pull(a)
+        return a
+    b.left = _merge(a, b.left)
+    _pull(b)
+    return b
+
+
+class RotationLog:
+    """
+    Rotation log that supports small edits without re-solving from scratch.
+
+    The moves are kept in an implicit treap (a randomized balanced binary tree
+    ordered by position). Every node stores the transition table of its own
+    move and the composed (end position, hits) table of its whole subtree, for
+    all 100 start positions, with zeros_on_move semantics. Updates, inserts and
+    deletes touch O(log n) nodes (expected), and total() reads the root.
+    """
+
+    def __init__(self, moves=()):
+        moves = list(moves)
+        prios = iter(sorted((random.random() for _ in moves), reverse=True))
+        tables = self._leaf_tables(moves)
+
+        def build(lo, hi):
+            if lo >= hi:
+                return None
+            mid = (lo + hi) // 2
+            # Pre-order assignment of descending priorities keeps the heap order
+            node = _LogNode(moves[mid], tables[mid], next(prios))
+            node.left = build(lo, mid)
+            node.right = build(mid + 1, hi)
+            _pull(node)
+            return node
+
+        self._root = build(0, len(moves))
+
+    @classmethod
+    def from_text(cls, text: str) -> "RotationLog":
+        is_right, dists = parse_rotations_array(text)
+        return cls(zip(np.where(is_right, "R", "L").tolist(), dists.tolist()))
+
+    @staticmethod
+    def _leaf_tables(moves, block_size: int = 4096):
+        starts = np.arange(100, dtype=np.int64)[None, :]
+        tables = []
+        for lo in range(0, len(moves), block_size):
+            block = moves[lo:lo + block_size]
+            for direction, _ in block:
+                if direction not in ("R", "L"):
+                    raise ValueError(f"Invalid direction: {direction!r}")
+            is_right = np.array([d == "R" for d, _ in block])[:, None]
+            dists = np.array([dist for _, dist in block], dtype=np.int64)[:, None]
+            ends, hits = zeros_on_moves(starts, is_right, dists)
+            tables.extend(zip(ends, hits))
+        return tables
+
+    def __len__(self) -> int:
+        return _size(self._root)
+
+    def table(self) -> tuple[np.ndarray, np.ndarray]:
+        """Composed (end, hits) table of the whole log."""
+        return self._root.agg if self._root is not None else identity_table()
+
+    def total(self, start: int = 50) -> int:
+        """Same as solve_classical on the current log (with pos starting at `start`)."""
+        return int(self.table()[1][start % 100])
+
+    def update(self, index: int, direction: str, dist: int) -> None:
+        """Replace the move at `index`."""
+        if not 0 <= index < len(self):
+            raise IndexError(f"move index {index} out of range")
+        table = move_table(direction, dist)
+
+        def go(node, k):
+            left_size = _size(node.left)
+            if k < left_size:
+                go(node.left, k)
+            elif k > left_size:
+                go(node.right, k - left_size - 1)
+            else:
+                node.move = (direction, dist)
+                node.table = table
+            _pull(node)
+
+        go(self._root, index)
+
+    def insert(self, index: int, direction: str, dist: int) -> None:
+        """Insert a move before position `index` (len(self) appends)."""
+        if not 0 <= index <= len(self):
+            raise IndexError(f"move index {index} out of range")
+        node = _LogNode((direction, dist), move_table(direction, dist), random.random())
+        left, right = _split(self._root, index)
+        self._root = _merge(_merge(left, node), right)
+
+    def delete(self, index: int) -> None:
+        """Remove the move at `index`."""
+        if not 0 <= index < len(self):
+            raise IndexError(f"move index {index} out of range")
+        left, rest = _split(self._root, index)
+        _, right = _split(rest, 1)
+        self._root = _merge(left, right)
+
+    def moves(self) -> list[tuple[str, int]]:
+        """Current moves in order."""
+        out = []
+        stack = []
+        node = self._root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            out.append(node.move)
+            node = node.right
+        return out
+
+
+def parse_rotations(text: str, num_states: int = NUM_STATES):
     rots = []
     for raw_line in text.splitlines():
         line = raw_line.strip()
         if not line:
             continue
         direction = line[0]
-        dist = int(line[1:]) % NUM_STATES
+        dist = int(line[1:]) % num_states
         rots.append((direction, dist))
     return rots
 
 
-def make_rotation_unitary(direction: str, dist: int) -> Operator:
-    dim = 2**NUM_QUBITS
-    mat = np.zeros((dim, dim), dtype=complex)
-
-    for basis in range(dim):
-        if basis < NUM_STATES:
-            if direction == "R":
-                new_basis = (basis + dist) % NUM_STATES
-            elif direction == "L":
-                new_basis = (basis - dist) % NUM_STATES
-            else:
-                raise ValueError(f"Invalid direction {direction!r}")
-        else:
-            new_basis = basis
-
-        mat[new_basis, basis] = 1.0
-
-    return Operator(mat)
-
+def crosses_zero(pos: int, direction: str, dist: int, num_states: int = NUM_STATES) -> bool:
+    """
+    True if the rotation lands on or passes through 0. Same as a non-zero
+    zeros_on_move count for a dist already reduced mod num_states.
+    """
+    if pos == 0 or dist <= 0:
+        return False
+    if direction == "R":
+        return pos + dist >= num_states
+    return dist >= pos
+
+
+def build_dial_circuit(
+    rotations,
+    compress: bool = False,
+    window: int | None = None,
+    gate_level: bool = False,
+    num_states: int = NUM_STATES,
+):
+    """
+    One dense rotation gate per line. With compress=True, runs of rotations
+    are merged (see common/dial_ops.py), but every rotation that passes
+    through 0 stays a gate of its own, since that is where Day 1.2 hits
+    happen. The rotations are already reduced mod 100 by parse_rotations, so
+    full extra turns (dist >= 100) are not visible in either circuit; the
+    hit count always comes from the classical solvers.
+
+    gate_level=True builds the modular-adder circuit of common/modular_adder.py
+    instead, which also works for a dial size other than 100 (parse the
+    rotations with the same num_states).
+    """
+    if compress:
+        isolate = partial(crosses_zero, num_states=num_states)
+        rotations = compress_rotations(rotations, window=window, isolate=isolate, num_states=num_states)
+
+    if gate_level:
+        return build_modular_dial_circuit(rotations, num_states=num_states)
+    if num_states != NUM_STATES:
+        raise ValueError(f"Dense rotation gates need a {NUM_STATES}-position dial, use gate_level=True")
 
-def build_dial_circuit(rotations):
     qc = QuantumCircuit(NUM_QUBITS, name="dial")
-    cache: dict[tuple[str, int], Operator] = {}
+    gates = {}
 
     for direction, dist in rotations:
         key = (direction, dist)
-        if key not in cache:
-            cache[key] = make_rotation_unitary(direction, dist)
-        op = cache[key]
-        qc.unitary(op, qc.qubits, label=f"{direction}{dist}")
+        if key not in gates:
+            # one validated gate per key, appended as the same instance every time
+            gates[key] = UnitaryGate(make_rotation_unitary(direction, dist), label=f"{direction}{dist}")
+        qc.append(gates[key], qc.qubits)
 
     return qc
 
@@ -126,6 +491,25 @@ def main() -> None:
     print(answer)
     print(f"Classical time: {classical_ms:.3f} ms")
 
+    # Vectorized NumPy solve
+    t0 = time.perf_counter()
+    numpy_answer = solve_numpy(text)
+    t1 = time.perf_counter()
+    numpy_ms = (t1 - t0) * 1000.0
+
+    print(f"NumPy answer: {numpy_answer}")
+    print(f"NumPy time: {numpy_ms:.3f} ms")
+
+    # Parallel prefix-scan solve (process pool)
+    workers = os.cpu_count() or 1
+    t0 = time.perf_counter()
+    parallel_answer = solve_parallel(text, workers=workers)
+    t1 = time.perf_counter()
+    parallel_ms = (t1 - t0) * 1000.0
+
+    print(f"Parallel answer: {parallel_answer}")
+    print(f"Parallel time ({workers} workers): {parallel_ms:.3f} ms")
+
     # Build circuits
     rotations = parse_rotations(text)
     dial_circuit = build_dial_circuit(rotations)
@@ -140,14 +524,11 @@ def main() -> None:
     print(answer_text)
 
     # Simulator just on the answer circuit (like before)
-    sim = AerSimulator()
     t2 = time.perf_counter()
-    job = sim.run(answer_circuit, shots=1024)
-    result = job.result()
+    counts = run_counts(answer_circuit, shots=1024)
     t3 = time.perf_counter()
     sim_ms = (t3 - t2) * 1000.0
 
-    counts = result.get_counts()
     top = sorted(counts.items(), key=lambda kv: -kv[1])[:5]
     print("Top measurement results:", top)
     print(f"Simulator time: {sim_ms:.3f} ms")
@@ -158,6 +539,8 @@ def main() -> None:
         f.write("AoC 2025 - Day 1 Part 2 (Qiskit)\n")
         f.write(f"Answer: {answer}\n")
         f.write(f"Classical time: {classical_ms:.3f} ms\n")
+        f.write(f"NumPy time: {numpy_ms:.3f} ms\n")
+        f.write(f"Parallel time ({workers} workers): {parallel_ms:.3f} ms\n")
         f.write(f"Simulator time: {sim_ms:.3f} ms\n")
         f.write(f"Top measurement results: {top}\n\n")
         f.write("Dial circuit (process):\n")
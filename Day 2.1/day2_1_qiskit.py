@@ -1,11 +1,25 @@
 from pathlib import Path
+import sys
 import time
 import numpy as np
 
-from qiskit import QuantumCircuit, QuantumRegister, ClassicalRegister
+from qiskit import QuantumCircuit, QuantumRegister, ClassicalRegister, transpile
+from qiskit.circuit import ParameterVector
 from qiskit.quantum_info import Operator
 from qiskit_aer import AerSimulator
 
+# Shared helpers live in <repo>/common
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from common.comparators import append_and_tree, cost_report, format_cost_report  # noqa: E402
+from common.execution import run_counts  # noqa: E402
+from common.invalid_id_index import InvalidIdIndex  # noqa: E402
+from common.range_kernel import equal_halves_mask, sum_matching  # noqa: E402
+from common.range_scan import parse_ranges, scan_ranges  # noqa: E402
+
+
+# Shared on-disk index of invalid IDs (see common/invalid_id_index.py)
+INDEX_DIR = Path(__file__).resolve().parents[1] / "invalid_id_index"
+
 
 # ---------- Classical solver ----------
 
@@ -37,6 +51,74 @@ def solve_classical(text: str) -> int:
     return total
 
 
+# ---------- Closed-form solver ----------
+
+def sum_invalid_in_range(start: int, end: int) -> int:
+    """
+    Sum of all "AA" IDs in [start, end] without visiting every integer.
+
+    An ID of length 2k made of a k-digit block A repeated twice equals
+    A * (10^k + 1), so for each k we clip A to the range and sum the
+    resulting arithmetic series.
+    """
+    total = 0
+    k = 1
+    while True:
+        mult = 10**k + 1
+        a_min = 10 ** (k - 1)
+        a_max = 10**k - 1
+        if a_min * mult > end:
+            break
+
+        lo = max(a_min, -(-start // mult))
+        hi = min(a_max, end // mult)
+        if lo <= hi:
+            total += mult * (lo + hi) * (hi - lo + 1) // 2
+        k += 1
+
+    return total
+
+
+def solve_closed_form(text: str) -> int:
+    line = text.strip()
+    total = 0
+
+    for token in line.split(","):
+        token = token.strip()
+        if not token:
+            continue
+
+        start_s, end_s = token.split("-")
+        total += sum_invalid_in_range(int(start_s), int(end_s))
+
+    return total
+
+
+def solve_parallel(text: str, workers: int | None = None, merge: bool = True) -> int:
+    """
+    Brute-force is_invalid_id scan on a process pool (see common/range_scan.py).
+    With merge=True overlapping ranges are merged first, so each ID counts once.
+    """
+    return scan_ranges(parse_ranges(text), is_invalid_id, workers=workers, merge=merge)
+
+
+def solve_vectorized(text: str) -> int:
+    """
+    Same answer as solve_classical, scanning each range in int64 blocks with
+    the NumPy kernel from common/range_kernel.py and its arithmetic form of
+    is_invalid_id (equal_halves_mask).
+    """
+    return sum_matching(parse_ranges(text), equal_halves_mask)
+
+
+def solve_indexed(text: str, max_digits: int = 10, index_dir: Path = INDEX_DIR) -> int:
+    """
+    Answer from the memory-mapped prefix-sum index of all invalid IDs with up
+    to `max_digits` digits (built on first use, then shared by every process).
+    """
+    return InvalidIdIndex(index_dir, "halves", max_digits).solve(text)
+
+
 # ---------- Puzzle circuit: "AA" pattern check ----------
 
 def build_equal_halves_circuit(num_pairs: int) -> QuantumCircuit:
@@ -54,13 +136,22 @@ def build_equal_halves_circuit(num_pairs: int) -> QuantumCircuit:
     qc = QuantumCircuit(data, anc, flag, c, name="equal_halves")
 
     # --- 1. Prepare an example invalid ID of the form AA ---
-    #
+    prepare_example_aa(qc, data, num_pairs)
+
+    append_equal_halves_check(qc, data, anc, flag, c, num_pairs)
+    return qc
+
+
+def prepare_example_aa(qc: QuantumCircuit, data, num_pairs: int) -> None:
     # We'll just choose some random bitstring for A; here we pick 101... pattern.
     for i in range(num_pairs):
         if i % 2 == 0:
             qc.x(data[i])         # set bit in first half
             qc.x(data[num_pairs + i])  # mirror into second half
 
+
+def append_equal_halves_check(qc: QuantumCircuit, data, anc, flag, c, num_pairs: int) -> None:
+    """Steps 2-4 of build_equal_halves_circuit: compare the halves, set and measure the flag."""
     # --- 2. Compare first half and second half into ancillas ---
     #
     # For each pair (x_i, x_{i+n}), we compute XOR into anc[i]:
@@ -91,30 +182,188 @@ def build_equal_halves_circuit(num_pairs: int) -> QuantumCircuit:
 
     qc.measure(flag[0], c[2 * num_pairs])
 
+
+# ---------- Depth-optimized comparator ----------
+
+def build_equal_halves_circuit_tree(num_pairs: int) -> QuantumCircuit:
+    """
+    Same registers, example input and measurements as build_equal_halves_circuit,
+    with a cheaper comparator:
+    - one parallel CX layer XORs the first half into the second half in place,
+    - a balanced CCX tree (common/comparators.py) ANDs the inverted mismatch
+      bits into the flag, using the 'cmp' register as clean ancillas,
+    - both steps are undone so the data qubits are measured unchanged.
+    """
+    data = QuantumRegister(2 * num_pairs, "x")
+    anc = QuantumRegister(num_pairs, "cmp")
+    flag = QuantumRegister(1, "flag")
+    c = ClassicalRegister(2 * num_pairs + 1, "c")
+    qc = QuantumCircuit(data, anc, flag, c, name="equal_halves_tree")
+
+    prepare_example_aa(qc, data, num_pairs)
+
+    second = data[num_pairs:]
+    for i in range(num_pairs):
+        qc.cx(data[i], second[i])
+    for i in range(num_pairs):
+        qc.x(second[i])
+
+    append_and_tree(qc, second, flag[0], anc)
+
+    for i in range(num_pairs):
+        qc.x(second[i])
+    for i in range(num_pairs):
+        qc.cx(data[i], second[i])
+
+    for i in range(2 * num_pairs):
+        qc.measure(data[i], c[i])
+    qc.measure(flag[0], c[2 * num_pairs])
+
     return qc
 
 
-# ---------- Small unitary example (optional visualization) ----------
+def compare_comparators(num_pairs: int, shots: int = 1024) -> dict:
+    """Depth, CX count and Aer time of the mcp comparator vs. the CCX-tree one."""
+    return cost_report(
+        {
+            "mcp(pi) + H": build_equal_halves_circuit(num_pairs),
+            "ccx tree": build_equal_halves_circuit_tree(num_pairs),
+        },
+        shots=shots,
+    )
 
-def build_pair_swap_unitary(num_pairs: int) -> Operator:
+
+# ---------- Batched circuit verification of real IDs ----------
+
+def build_equal_halves_template(num_pairs: int) -> tuple[QuantumCircuit, ParameterVector]:
     """
-    For completeness: build a unitary that swaps first and second halves of the
-    2*num_pairs data bits. This is another way of encoding the 'AA' structure,
-    but we only use it if we want to attach a big unitary block to the circuit.
+    Same comparator as build_equal_halves_circuit, but the data bits are
+    parameters: data[i] gets RX(bits[i]), so binding pi/0 loads a 1/0 bit.
+    One template (and one transpile) serves every ID of this bit width.
     """
-    dim = 2 ** (2 * num_pairs)
-    mat = np.zeros((dim, dim), dtype=complex)
+    data = QuantumRegister(2 * num_pairs, "x")
+    anc = QuantumRegister(num_pairs, "cmp")
+    flag = QuantumRegister(1, "flag")
+    c = ClassicalRegister(2 * num_pairs + 1, "c")
+    qc = QuantumCircuit(data, anc, flag, c, name=f"equal_halves_{num_pairs}")
+
+    bits = ParameterVector("bits", 2 * num_pairs)
+    for i in range(2 * num_pairs):
+        qc.rx(bits[i], data[i])
+
+    append_equal_halves_check(qc, data, anc, flag, c, num_pairs)
+    return qc, bits
+
+
+def id_halves(n: int) -> tuple[int, int, int] | None:
+    """(first half, second half, decimal half length) of an even-length ID, else None."""
+    s = str(n)
+    if len(s) % 2 == 1:
+        return None
+    half = len(s) // 2
+    return int(s[:half]), int(s[half:]), half
+
+
+def verify_ids_batched(ids, shots: int = 1, simulator=None) -> list[bool]:
+    """
+    Check "is the ID of the form AA" for many IDs with the comparator circuit.
+
+    The two decimal halves are loaded as binary numbers into the two halves of
+    the data register, one template per bit width is transpiled once, and all
+    IDs are bound in bulk through parameter_binds, so everything runs as a
+    single AerSimulator job with parallel experiments. Odd-length IDs are
+    invalid-free by definition and never reach the simulator.
+    """
+    if simulator is None:
+        # Matrix-product-state: the prepared states are product states, which
+        # keeps wide (10-20 digit) comparators cheap to simulate.
+        simulator = AerSimulator(method="matrix_product_state")
+
+    ids = list(ids)
+    results = [False] * len(ids)
+    groups: dict[int, list[tuple[int, int, int]]] = {}
+    for pos, n in enumerate(ids):
+        halves = id_halves(n)
+        if halves is None:
+            continue
+        first, second, half_len = halves
+        num_pairs = (10**half_len - 1).bit_length()
+        groups.setdefault(num_pairs, []).append((pos, first, second))
+
+    if not groups:
+        return results
 
-    for basis in range(dim):
-        # decode bits
-        bits = [(basis >> i) & 1 for i in range(2 * num_pairs)]
-        # swap halves
-        new_bits = bits[num_pairs:] + bits[:num_pairs]
-        new_index = 0
-        for i, b in enumerate(new_bits):
-            new_index |= (b << i)
-        mat[new_index, basis] = 1.0
+    circuits = []
+    binds = []
+    order = []
+    for num_pairs, members in sorted(groups.items()):
+        template, bits = build_equal_halves_template(num_pairs)
+        circuits.append(transpile(template, simulator))
+        values = {param: [] for param in bits}
+        for pos, first, second in members:
+            for i in range(num_pairs):
+                values[bits[i]].append(np.pi * ((first >> i) & 1))
+                values[bits[num_pairs + i]].append(np.pi * ((second >> i) & 1))
+            order.append(pos)
+        binds.append(values)
 
+    result = simulator.run(
+        circuits, parameter_binds=binds, shots=shots, max_parallel_experiments=0
+    ).result()
+
+    for experiment, pos in enumerate(order):
+        counts = result.get_counts(experiment)
+        outcome = max(counts, key=counts.get)
+        results[pos] = outcome[0] == "1"   # flag is the last (leftmost) clbit
+    return results
+
+
+def solve_batched(text: str, shots: int = 1) -> int:
+    """Circuit-checked answer: every ID of every range goes through verify_ids_batched."""
+    candidates = [n for start, end in parse_ranges(text) for n in range(start, end + 1)]
+    flags = verify_ids_batched(candidates, shots=shots)
+    return sum(n for n, flag in zip(candidates, flags) if flag)
+
+
+# ---------- Half-swap: SWAP network (dense unitary only for small widths) ----------
+
+# 2^(2*5) = 1024 -> a 1024x1024 complex matrix is 16 MiB; each extra pair is 16x more.
+MAX_DENSE_SWAP_PAIRS = 5
+
+
+def build_pair_swap_circuit(num_pairs: int) -> QuantumCircuit:
+    """
+    Swap the first and second halves of the 2*num_pairs data bits with one
+    layer of num_pairs SWAP gates on disjoint qubits (depth 1, no dense matrix),
+    so it scales to the 10-20 digit ID widths.
+    """
+    qc = QuantumCircuit(2 * num_pairs, name="pair_swap")
+    for i in range(num_pairs):
+        qc.swap(i, num_pairs + i)
+    return qc
+
+
+def build_pair_swap_unitary(num_pairs: int, max_dense_pairs: int = MAX_DENSE_SWAP_PAIRS) -> Operator:
+    """
+    For completeness: the same half-swap as a dense 4^num_pairs unitary.
+    This is another way of encoding the 'AA' structure, but its size grows
+    as 16^num_pairs, so it is refused above `max_dense_pairs`; use
+    build_pair_swap_circuit for anything larger.
+    """
+    if num_pairs > max_dense_pairs:
+        raise ValueError(
+            f"Dense pair-swap unitary for {num_pairs} pairs needs a "
+            f"{4**num_pairs}x{4**num_pairs} matrix; use build_pair_swap_circuit "
+            f"or raise max_dense_pairs explicitly"
+        )
+
+    dim = 2 ** (2 * num_pairs)
+    low_mask = (1 << num_pairs) - 1
+    basis = np.arange(dim)
+    new_index = ((basis & low_mask) << num_pairs) | (basis >> num_pairs)
+
+    mat = np.zeros((dim, dim), dtype=complex)
+    mat[new_index, basis] = 1.0
     return Operator(mat)
 
 
@@ -132,6 +381,15 @@ def main() -> None:
     print(answer)
     print(f"Classical time: {classical_ms:.3f} ms")
 
+    # Closed-form solve
+    t0 = time.perf_counter()
+    closed_answer = solve_closed_form(text)
+    t1 = time.perf_counter()
+    closed_ms = (t1 - t0) * 1000.0
+
+    print(f"Closed-form answer: {closed_answer}")
+    print(f"Closed-form time: {closed_ms:.3f} ms")
+
     # Build a puzzle circuit for, say, 3 bit-pairs (6 bits total => length-6 ID)
     num_pairs = 3
     eq_circuit = build_equal_halves_circuit(num_pairs)
@@ -140,29 +398,35 @@ def main() -> None:
     print(eq_circuit_text)
 
     # Optional: run on simulator just to show it's valid
-    sim = AerSimulator()
     t2 = time.perf_counter()
-    job = sim.run(eq_circuit, shots=1024)
-    result = job.result()
+    counts = run_counts(eq_circuit, shots=1024)
     t3 = time.perf_counter()
     sim_ms = (t3 - t2) * 1000.0
 
-    counts = result.get_counts()
     top = sorted(counts.items(), key=lambda kv: -kv[1])[:5]
     print("Top measurement results (puzzle circuit):", top)
     print(f"Simulator time: {sim_ms:.3f} ms")
 
+    # Comparator variants: cost before/after the CCX-tree rewrite
+    cost_text = format_cost_report(compare_comparators(num_pairs))
+    print("\nComparator variants (transpiled to cx+u):")
+    print(cost_text)
+
     # Dump everything to a txt file
     out_path = Path("day2_1_qiskit_output.txt")
     with out_path.open("w", encoding="utf-8") as f:
         f.write("AoC 2025 - Day 2 Part 1 (Qiskit)\n")
         f.write(f"Answer: {answer}\n")
         f.write(f"Classical time: {classical_ms:.3f} ms\n")
+        f.write(f"Closed-form time: {closed_ms:.3f} ms\n")
         f.write(f"Simulator time (puzzle circuit): {sim_ms:.3f} ms\n")
         f.write(f"Top measurement results: {top}\n\n")
         f.write("Equal-halves puzzle circuit:\n")
         f.write(str(eq_circuit_text))
         f.write("\n")
+        f.write("\nComparator variants (transpiled to cx+u):\n")
+        f.write(cost_text)
+        f.write("\n")
 
 
 if __name__ == "__main__":
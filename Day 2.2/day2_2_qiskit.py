@@ -1,9 +1,21 @@
 from pathlib import Path
+import sys
 import time
 import numpy as np
 
 from qiskit import QuantumCircuit, QuantumRegister, ClassicalRegister
-from qiskit_aer import AerSimulator
+
+# Shared helpers live in <repo>/common
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from common.comparators import append_and_tree, cost_report, format_cost_report  # noqa: E402
+from common.execution import run_counts  # noqa: E402
+from common.invalid_id_index import InvalidIdIndex  # noqa: E402
+from common.range_kernel import repeated_block_mask, sum_matching  # noqa: E402
+from common.range_scan import parse_ranges, scan_ranges  # noqa: E402
+
+
+# Shared on-disk index of invalid IDs (see common/invalid_id_index.py)
+INDEX_DIR = Path(__file__).resolve().parents[1] / "invalid_id_index"
 
 
 # ---------- Classical solver ----------
@@ -52,6 +64,100 @@ def solve_classical(text: str) -> int:
     return total
 
 
+# ---------- Closed-form solver (inclusion-exclusion over divisors) ----------
+
+def mobius(n: int) -> int:
+    result = 1
+    p = 2
+    while p * p <= n:
+        if n % p == 0:
+            n //= p
+            if n % p == 0:
+                return 0
+            result = -result
+        p += 1
+    if n > 1:
+        result = -result
+    return result
+
+
+def sum_block_repeats(length: int, block_len: int, start: int, end: int) -> int:
+    """
+    Sum of the `length`-digit IDs in [start, end] that are one `block_len`-digit
+    block A repeated: A * (10^(length-1) + ... + 1) with the 1s every block_len digits.
+    """
+    mult = (10**length - 1) // (10**block_len - 1)
+    lo = max(10 ** (block_len - 1), -(-start // mult))
+    hi = min(10**block_len - 1, end // mult)
+    if lo > hi:
+        return 0
+    return mult * (lo + hi) * (hi - lo + 1) // 2
+
+
+def sum_invalid_in_range(start: int, end: int) -> int:
+    """
+    Sum of all "block repeated >= 2 times" IDs in [start, end].
+
+    For each digit length L, an ID is invalid if it repeats a block of length
+    L/d for some divisor d > 1. Numbers repeating blocks of length L/d and L/e
+    also repeat blocks of length L/lcm(d, e) (111111 = 1x6 = 11x3 = 111x2),
+    so the union is summed with Moebius weights: -mu(d) * sum(blocks of L/d).
+    """
+    total = 0
+    for length in range(2, len(str(max(end, 0))) + 1):
+        lo = max(start, 10 ** (length - 1))
+        hi = min(end, 10**length - 1)
+        if lo > hi:
+            continue
+        for d in range(2, length + 1):
+            if length % d:
+                continue
+            mu = mobius(d)
+            if mu:
+                total -= mu * sum_block_repeats(length, length // d, lo, hi)
+    return total
+
+
+def solve_closed_form(text: str) -> int:
+    line = text.strip()
+    total = 0
+
+    for token in line.split(","):
+        token = token.strip()
+        if not token:
+            continue
+
+        start_s, end_s = token.split("-")
+        total += sum_invalid_in_range(int(start_s), int(end_s))
+
+    return total
+
+
+def solve_parallel(text: str, workers: int | None = None, merge: bool = True) -> int:
+    """
+    Brute-force is_invalid_id scan on a process pool (see common/range_scan.py).
+    With merge=True overlapping ranges are merged first, so each ID counts once.
+    """
+    return scan_ranges(parse_ranges(text), is_invalid_id, workers=workers, merge=merge)
+
+
+def solve_vectorized(text: str) -> int:
+    """
+    Same answer as solve_classical, scanning each range in int64 blocks with
+    the NumPy kernel from common/range_kernel.py and its arithmetic form of
+    is_invalid_id (repeated_block_mask).
+    """
+    return sum_matching(parse_ranges(text), repeated_block_mask)
+
+
+def solve_indexed(text: str, max_digits: int = 10, index_dir: Path = INDEX_DIR) -> int:
+    """
+    Answer from the memory-mapped prefix-sum index of all invalid IDs with up
+    to `max_digits` digits (built on first use, then shared by every process).
+    """
+    return InvalidIdIndex(index_dir, "repeats", max_digits).solve(text)
+
+
 # ---------- Puzzle circuit: repeated pattern check ----------
 
 def build_repeat_pattern_circuit() -> QuantumCircuit:
@@ -123,6 +229,59 @@ def build_repeat_pattern_circuit() -> QuantumCircuit:
     return qc
 
 
+def build_repeat_pattern_circuit_tree() -> QuantumCircuit:
+    """
+    Same registers, example input (A A A with A = '10') and measurements as
+    build_repeat_pattern_circuit, with a cheaper comparator: blocks 1 and 2 are
+    XORed with block 0 in place, the inverted mismatch bits are ANDed into the
+    flag with a CCX tree (cmp[0:2] as clean ancillas), and everything is undone.
+    """
+    num_blocks = 3
+    block_len = 2
+    num_data = num_blocks * block_len
+
+    data = QuantumRegister(num_data, "x")
+    cmp = QuantumRegister(4, "cmp")
+    flag = QuantumRegister(1, "flag")
+    c = ClassicalRegister(num_data + 1, "c")
+
+    qc = QuantumCircuit(data, cmp, flag, c, name="repeat_pattern_tree")
+
+    for block in range(num_blocks):
+        qc.x(data[block * block_len])
+
+    # data[2:6] ^= block 0 (two CX layers: each block-0 bit feeds two targets)
+    mismatch = data[block_len:]
+    for i, target in enumerate(mismatch):
+        qc.cx(data[i % block_len], target)
+    for target in mismatch:
+        qc.x(target)
+
+    append_and_tree(qc, mismatch, flag[0], cmp)
+
+    for target in mismatch:
+        qc.x(target)
+    for i, target in enumerate(mismatch):
+        qc.cx(data[i % block_len], target)
+
+    for i in range(num_data):
+        qc.measure(data[i], c[i])
+    qc.measure(flag[0], c[num_data])
+
+    return qc
+
+
+def compare_comparators(shots: int = 1024) -> dict:
+    """Depth, CX count and Aer time of the mcp comparator vs. the CCX-tree one."""
+    return cost_report(
+        {
+            "mcp(pi) + H": build_repeat_pattern_circuit(),
+            "ccx tree": build_repeat_pattern_circuit_tree(),
+        },
+        shots=shots,
+    )
+
+
 # ---------- Main ----------
 
 def main() -> None:
@@ -137,6 +296,15 @@ def main() -> None:
     print(answer)
     print(f"Classical time: {classical_ms:.3f} ms")
 
+    # Closed-form solve
+    t0 = time.perf_counter()
+    closed_answer = solve_closed_form(text)
+    t1 = time.perf_counter()
+    closed_ms = (t1 - t0) * 1000.0
+
+    print(f"Closed-form answer: {closed_answer}")
+    print(f"Closed-form time: {closed_ms:.3f} ms")
+
     # Build the repeat-pattern puzzle circuit
     repeat_circuit = build_repeat_pattern_circuit()
     repeat_text = repeat_circuit.draw(output="text")
@@ -144,29 +312,35 @@ def main() -> None:
     print(repeat_text)
 
     # Run on simulator (just to show it's valid)
-    sim = AerSimulator()
     t2 = time.perf_counter()
-    job = sim.run(repeat_circuit, shots=1024)
-    result = job.result()
+    counts = run_counts(repeat_circuit, shots=1024)
     t3 = time.perf_counter()
     sim_ms = (t3 - t2) * 1000.0
 
-    counts = result.get_counts()
     top = sorted(counts.items(), key=lambda kv: -kv[1])[:5]
     print("Top measurement results (puzzle circuit):", top)
     print(f"Simulator time: {sim_ms:.3f} ms")
 
+    # Comparator variants: cost before/after the CCX-tree rewrite
+    cost_text = format_cost_report(compare_comparators())
+    print("\nComparator variants (transpiled to cx+u):")
+    print(cost_text)
+
     # Dump everything to a txt file
     out_path = Path("day2_2_qiskit_output.txt")
     with out_path.open("w", encoding="utf-8") as f:
         f.write("AoC 2025 - Day 2 Part 2 (Qiskit)\n")
         f.write(f"Answer: {answer}\n")
         f.write(f"Classical time: {classical_ms:.3f} ms\n")
+        f.write(f"Closed-form time: {closed_ms:.3f} ms\n")
         f.write(f"Simulator time (puzzle circuit): {sim_ms:.3f} ms\n")
         f.write(f"Top measurement results: {top}\n\n")
         f.write("Repeat-pattern puzzle circuit:\n")
         f.write(str(repeat_text))
         f.write("\n")
+        f.write("\nComparator variants (transpiled to cx+u):\n")
+        f.write(cost_text)
+        f.write("\n")
 
 
 if __name__ == "__main__":
@@ -1,8 +1,15 @@
+import os
 from pathlib import Path
+import sys
 import time
+import numpy as np
 
 from qiskit import QuantumCircuit, QuantumRegister, ClassicalRegister
-from qiskit_aer import AerSimulator
+
+# Shared helpers live in <repo>/common
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from common.execution import run_counts  # noqa: E402
+from common.line_shards import solve_sharded  # noqa: E402
 
 
 # ---------- Classical solver ----------
@@ -37,6 +44,63 @@ def solve_classical(text: str) -> int:
     return total
 
 
+# ---------- Vectorized NumPy solver ----------
+
+def best_pairs(digits: np.ndarray) -> np.ndarray:
+    """
+    Row-wise max_joltage_for_bank for a 2D array of digits (one bank per row):
+    suffix maxima via a reversed np.maximum.accumulate, then the best
+    10 * tens + best-later-ones per row.
+    """
+    if digits.shape[1] < 2:
+        return np.zeros(digits.shape[0], dtype=np.int64)
+    suffix_max = np.maximum.accumulate(digits[:, :0:-1], axis=1)[:, ::-1]
+    pairs = 10 * digits[:, :-1].astype(np.int64) + suffix_max
+    return pairs.max(axis=1)
+
+
+def max_joltage_batch(lines, rows_per_block: int = 65536) -> np.ndarray:
+    """
+    max_joltage_for_bank for many banks at once. Ragged input is grouped by
+    bank length; each group is loaded with np.frombuffer as a 2D uint8 array
+    and processed in blocks of rows. Banks with non-digit characters fall
+    back to max_joltage_for_bank.
+    """
+    banks = [line.strip() for line in lines]
+    banks = [bank for bank in banks if bank]
+    result = np.zeros(len(banks), dtype=np.int64)
+
+    groups: dict[int, list[int]] = {}
+    for i, bank in enumerate(banks):
+        groups.setdefault(len(bank), []).append(i)
+
+    for length, members in groups.items():
+        for lo in range(0, len(members), rows_per_block):
+            rows = np.array(members[lo:lo + rows_per_block])
+            raw = "".join(banks[i] for i in rows).encode("ascii", errors="replace")
+            digits = np.frombuffer(raw, dtype=np.uint8).reshape(len(rows), length) - ord("0")
+
+            clean = (digits <= 9).all(axis=1)
+            result[rows[clean]] = best_pairs(digits[clean])
+            for i in rows[~clean]:
+                result[i] = max_joltage_for_bank(banks[i])
+
+    return result
+
+
+def solve_numpy(text: str) -> int:
+    return int(max_joltage_batch(text.splitlines()).sum())
+
+
+def solve_parallel(path="input.txt", workers: int | None = None) -> int:
+    """
+    Same answer as solve_classical for the file at `path`: newline-aligned
+    shards of the memory-mapped file are scored with max_joltage_for_bank on a
+    process pool (see common/line_shards.py).
+    """
+    return solve_sharded(path, max_joltage_for_bank, workers=workers)
+
+
 # ---------- Puzzle circuit: toy "max pair" logic ----------
 
 def build_max_pair_puzzle_circuit() -> QuantumCircuit:
@@ -89,6 +153,25 @@ def main() -> None:
     print(answer)
     print(f"Classical time: {classical_ms:.3f} ms")
 
+    # Vectorized NumPy solve
+    t0 = time.perf_counter()
+    numpy_answer = solve_numpy(text)
+    t1 = time.perf_counter()
+    numpy_ms = (t1 - t0) * 1000.0
+
+    print(f"NumPy answer: {numpy_answer}")
+    print(f"NumPy time: {numpy_ms:.3f} ms")
+
+    # Sharded solve straight from the memory-mapped file (process pool)
+    workers = os.cpu_count() or 1
+    t0 = time.perf_counter()
+    parallel_answer = solve_parallel("input.txt", workers=workers)
+    t1 = time.perf_counter()
+    parallel_ms = (t1 - t0) * 1000.0
+
+    print(f"Parallel answer: {parallel_answer}")
+    print(f"Parallel time ({workers} workers): {parallel_ms:.3f} ms")
+
     # Build the toy "max pair" circuit
     puzzle_circuit = build_max_pair_puzzle_circuit()
     puzzle_text = puzzle_circuit.draw(output="text")
@@ -96,14 +179,11 @@ def main() -> None:
     print(puzzle_text)
 
     # Run on simulator
-    sim = AerSimulator()
     t2 = time.perf_counter()
-    job = sim.run(puzzle_circuit, shots=1024)
-    result = job.result()
+    counts = run_counts(puzzle_circuit, shots=1024)
     t3 = time.perf_counter()
     sim_ms = (t3 - t2) * 1000.0
 
-    counts = result.get_counts()
     top = sorted(counts.items(), key=lambda kv: -kv[1])[:5]
     print("Top measurement results (puzzle circuit):", top)
     print(f"Simulator time: {sim_ms:.3f} ms")
@@ -114,6 +194,8 @@ def main() -> None:
         f.write("AoC 2025 - Day 3 Part 1 (Qiskit)\n")
         f.write(f"Answer: {answer}\n")
         f.write(f"Classical time: {classical_ms:.3f} ms\n")
+        f.write(f"NumPy time: {numpy_ms:.3f} ms\n")
+        f.write(f"Parallel time ({workers} workers): {parallel_ms:.3f} ms\n")
         f.write(f"Simulator time (puzzle circuit): {sim_ms:.3f} ms\n")
         f.write(f"Top measurement results: {top}\n\n")
         f.write("Toy max-pair puzzle circuit:\n")
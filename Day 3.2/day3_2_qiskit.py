@@ -1,23 +1,60 @@
+import mmap
+import os
 from pathlib import Path
+import sys
 import time
+import numpy as np
 
 from qiskit import QuantumCircuit, QuantumRegister, ClassicalRegister
-from qiskit_aer import AerSimulator
+
+# Shared helpers live in <repo>/common
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from common.execution import run_counts  # noqa: E402
+from common.line_shards import solve_sharded  # noqa: E402
 
 
 # ---------- Classical solver (same idea as Rust/Mojo) ----------
 
+K = 12  # digits picked per bank
+
+
+def max_joltage(line: str, k: int = K) -> int:
+    """
+    Largest k-digit number that keeps the bank's digit order, in O(n):
+    a monotonic stack pops smaller digits while we can still afford to drop
+    digits (n - k drops in total), then the first k stack entries are the answer.
+    """
+    digits = [ch for ch in line.strip() if ch.isdigit()]
+    n = len(digits)
+    if k <= 0 or n < k:
+        return 0
+
+    drops = n - k
+    stack = []
+    for d in digits:
+        while drops and stack and stack[-1] < d:
+            stack.pop()
+            drops -= 1
+        stack.append(d)
+
+    return int("".join(stack[:k]))
+
+
 def max_joltage_12(line: str) -> int:
-    K = 12
+    return max_joltage(line, 12)
+
+
+def max_joltage_greedy(line: str, k: int = K) -> int:
+    """Reference O(n*k) greedy scan (the original solver), kept for cross-checks."""
     digits = [int(ch) for ch in line.strip() if ch.isdigit()]
     n = len(digits)
-    if n < K:
+    if n < k:
         return 0
 
     result = []
     start_idx = 0
-    for pos in range(K):
-        remaining_slots = K - pos
+    for pos in range(k):
+        remaining_slots = k - pos
         end_idx = n - remaining_slots
         best_digit = -1
         best_pos = start_idx
@@ -37,16 +74,137 @@ def max_joltage_12(line: str) -> int:
     return val
 
 
-def solve_classical(text: str) -> int:
+def solve_classical(text: str, k: int = K) -> int:
     total = 0
     for line in text.splitlines():
         line = line.strip()
         if not line:
             continue
-        total += max_joltage_12(line)
+        total += max_joltage(line, k)
     return total
 
 
+def solve_parallel(path="input.txt", workers: int | None = None) -> int:
+    """
+    Same answer as solve_classical for the file at `path`: newline-aligned
+    shards of the memory-mapped file are scored with max_joltage_12 on a
+    process pool (see common/line_shards.py).
+    """
+    return solve_sharded(path, max_joltage_12, workers=workers)
+
+
+# ---------- Streaming solver for one huge bank ----------
+
+NON_DIGITS = bytes(b for b in range(256) if not 48 <= b <= 57)
+STREAM_CHUNK = 1 << 20
+
+
+def _digit_chunks(buf, chunk_size: int):
+    """The digits of `buf` (bytes-like, e.g. an mmap), `chunk_size` bytes at a time."""
+    for lo in range(0, len(buf), chunk_size):
+        yield bytes(buf[lo:lo + chunk_size]).translate(None, NON_DIGITS)
+
+
+def _stream_digits(buf, k: int, chunk_size: int) -> int:
+    """Bounded-stack pass over the digits of `buf`, skipping every other byte like max_joltage."""
+    # cheap first pass (bytes.translate runs in C): the pop rule needs the
+    # number of digits, not bytes, still to come
+    n = sum(len(chunk) for chunk in _digit_chunks(buf, chunk_size))
+    if k <= 0 or n < k:
+        return 0
+
+    stack = []  # ASCII codes, at most k of them
+    remaining = n
+    for chunk in _digit_chunks(buf, chunk_size):
+        for d in chunk:
+            # pop only while the digits left can still refill the stack to k
+            while stack and stack[-1] < d and len(stack) - 1 + remaining >= k:
+                stack.pop()
+            if len(stack) < k:
+                stack.append(d)
+            remaining -= 1
+
+    return int(bytes(stack))
+
+
+def max_joltage_stream(source, k: int = K, chunk_size: int = STREAM_CHUNK) -> int:
+    """
+    Same as max_joltage() for a single bank, in O(k + chunk_size) memory.
+    `source` is a path to a file holding one bank, or any bytes-like object
+    (bytes, mmap, memoryview); files are memory-mapped and read in
+    `chunk_size` byte slices. Non-digit bytes are skipped, as in max_joltage.
+    The buffer is read twice in order: a fast digit count, then the stack pass.
+    """
+    if not isinstance(source, (str, Path)):
+        return _stream_digits(source, k, chunk_size)
+
+    with open(source, "rb") as f:
+        if f.seek(0, 2) == 0:
+            return 0  # mmap refuses empty files
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return _stream_digits(mm, k, chunk_size)
+
+
+# ---------- Multi-K query index ----------
+
+class BankIndex:
+    """
+    Sparse table over one bank that answers "largest digit in window, leftmost
+    on ties" in O(1), so the greedy pick of the best k-digit value costs O(k)
+    for any k after a single O(n log n) build.
+
+    Each entry packs (digit, position) into one int: digit * (n + 1) + (n - pos),
+    so a plain max picks the larger digit first and the smaller position second.
+    """
+
+    def __init__(self, line: str):
+        digits = "".join(ch for ch in line.strip() if ch.isdigit())
+        self.n = n = len(digits)
+        values = np.frombuffer(digits.encode("ascii"), dtype=np.uint8).astype(np.int64) - ord("0")
+        keys = values * (n + 1) + (n - np.arange(n, dtype=np.int64))
+
+        self.levels = [keys]
+        width = 1
+        while 2 * width <= n:
+            prev = self.levels[-1]
+            self.levels.append(np.maximum(prev[:-width], prev[width:]))
+            width *= 2
+
+    def window_max(self, lo: int, hi: int) -> tuple[int, int]:
+        """(digit, position) of the leftmost largest digit in positions lo..hi."""
+        j = (hi - lo + 1).bit_length() - 1
+        level = self.levels[j]
+        key = int(max(level[lo], level[hi - (1 << j) + 1]))
+        return key // (self.n + 1), self.n - key % (self.n + 1)
+
+    def best(self, k: int) -> int:
+        """Same as max_joltage(line, k)."""
+        if k <= 0 or self.n < k:
+            return 0
+        val = 0
+        start = 0
+        for slot in range(k):
+            digit, pos = self.window_max(start, self.n - (k - slot))
+            val = val * 10 + digit
+            start = pos + 1
+        return val
+
+    def best_many(self, ks) -> dict[int, int]:
+        return {k: self.best(k) for k in ks}
+
+
+def solve_multi_k(text: str, ks=(2, 4, 8, 12)) -> dict[int, int]:
+    """Totals for several K values with one index build per bank."""
+    totals = {k: 0 for k in ks}
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        for k, val in BankIndex(line).best_many(ks).items():
+            totals[k] += val
+    return totals
+
+
 # ---------- Puzzle circuit: toy subsequence chooser ----------
 
 def build_subsequence_puzzle_circuit() -> QuantumCircuit:
@@ -91,6 +249,23 @@ def main() -> None:
     print(answer)
     print(f"Classical time: {classical_ms:.3f} ms")
 
+    # Several K values from one index per bank
+    t0 = time.perf_counter()
+    multi_k = solve_multi_k(text)
+    multi_ms = (time.perf_counter() - t0) * 1000.0
+    print("Multi-K totals:", multi_k)
+    print(f"Multi-K index time: {multi_ms:.3f} ms")
+
+    # Sharded solve straight from the memory-mapped file (process pool)
+    workers = os.cpu_count() or 1
+    t0 = time.perf_counter()
+    parallel_answer = solve_parallel("input.txt", workers=workers)
+    t1 = time.perf_counter()
+    parallel_ms = (t1 - t0) * 1000.0
+
+    print(f"Parallel answer: {parallel_answer}")
+    print(f"Parallel time ({workers} workers): {parallel_ms:.3f} ms")
+
     # Build toy subsequence puzzle circuit
     puzzle_circuit = build_subsequence_puzzle_circuit()
     puzzle_text = puzzle_circuit.draw(output="text")
@@ -98,14 +273,11 @@ def main() -> None:
     print(puzzle_text)
 
     # Run on simulator
-    sim = AerSimulator()
     t2 = time.perf_counter()
-    job = sim.run(puzzle_circuit, shots=1024)
-    result = job.result()
+    counts = run_counts(puzzle_circuit, shots=1024)
     t3 = time.perf_counter()
     sim_ms = (t3 - t2) * 1000.0
 
-    counts = result.get_counts()
     top = sorted(counts.items(), key=lambda kv: -kv[1])[:5]
     print("Top measurement results (puzzle circuit):", top)
     print(f"Simulator time: {sim_ms:.3f} ms")
@@ -116,6 +288,8 @@ def main() -> None:
         f.write("AoC 2025 - Day 3 Part 2 (Qiskit)\n")
         f.write(f"Answer: {answer}\n")
         f.write(f"Classical time: {classical_ms:.3f} ms\n")
+        f.write(f"Multi-K totals: {multi_k} ({multi_ms:.3f} ms)\n")
+        f.write(f"Parallel time ({workers} workers): {parallel_ms:.3f} ms\n")
         f.write(f"Simulator time (puzzle circuit): {sim_ms:.3f} ms\n")
         f.write(f"Top measurement results: {top}\n\n")
         f.write("Toy subsequence puzzle circuit:\n")
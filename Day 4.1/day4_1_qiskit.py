@@ -1,8 +1,13 @@
 from pathlib import Path
+import sys
 import time
+import numpy as np
 
 from qiskit import QuantumCircuit, QuantumRegister, ClassicalRegister
-from qiskit_aer import AerSimulator
+
+# Shared helpers live in <repo>/common
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from common.execution import run_counts  # noqa: E402
 
 
 # ---------- Classical solver ----------
@@ -38,6 +43,42 @@ def solve_classical(text: str) -> int:
     return accessible
 
 
+# ---------- Vectorized NumPy solver ----------
+
+def parse_grid_array(text: str) -> np.ndarray:
+    """Boolean (h, w) array with True where the grid has a roll ('@')."""
+    rows = [line.strip() for line in text.splitlines() if line.strip()]
+    if not rows:
+        return np.zeros((0, 0), dtype=bool)
+    w = max(len(row) for row in rows)
+    raw = "".join(row.ljust(w, ".") for row in rows).encode("ascii", errors="replace")
+    return (np.frombuffer(raw, dtype=np.uint8) == ord("@")).reshape(len(rows), w)
+
+
+def neighbor_counts(grid: np.ndarray) -> np.ndarray:
+    """
+    Number of '@' among the 8 neighbours of every cell: the grid is padded
+    with a ring of zeros and the 8 shifted (h, w) windows are summed.
+    """
+    h, w = grid.shape
+    padded = np.zeros((h + 2, w + 2), dtype=np.uint8)
+    padded[1:-1, 1:-1] = grid
+
+    counts = np.zeros((h, w), dtype=np.uint8)
+    for dy in (0, 1, 2):
+        for dx in (0, 1, 2):
+            if dy == 1 and dx == 1:
+                continue
+            counts += padded[dy:dy + h, dx:dx + w]
+    return counts
+
+
+def solve_numpy(text: str) -> int:
+    """Same answer as solve_classical: rolls with fewer than 4 neighbouring rolls."""
+    grid = parse_grid_array(text)
+    return int(np.count_nonzero(grid & (neighbor_counts(grid) < 4)))
+
+
 # ---------- Puzzle circuit: toy forklift-access pattern ----------
 
 def build_forklift_puzzle_circuit() -> QuantumCircuit:
@@ -95,6 +136,15 @@ def main() -> None:
     print(answer)
     print(f"Classical time: {classical_ms:.3f} ms")
 
+    # Vectorized NumPy solve
+    t0 = time.perf_counter()
+    numpy_answer = solve_numpy(text)
+    t1 = time.perf_counter()
+    numpy_ms = (t1 - t0) * 1000.0
+
+    print(f"NumPy answer: {numpy_answer}")
+    print(f"NumPy time: {numpy_ms:.3f} ms")
+
     # Build puzzle circuit
     puzzle_circuit = build_forklift_puzzle_circuit()
     puzzle_text = puzzle_circuit.draw(output="text")
@@ -102,14 +152,11 @@ def main() -> None:
     print(puzzle_text)
 
     # Run on simulator
-    sim = AerSimulator()
     t2 = time.perf_counter()
-    job = sim.run(puzzle_circuit, shots=1024)
-    result = job.result()
+    counts = run_counts(puzzle_circuit, shots=1024)
     t3 = time.perf_counter()
     sim_ms = (t3 - t2) * 1000.0
 
-    counts = result.get_counts()
     top = sorted(counts.items(), key=lambda kv: -kv[1])[:5]
     print("Top measurement results (puzzle circuit):", top)
     print(f"Simulator time: {sim_ms:.3f} ms")
@@ -120,6 +167,7 @@ def main() -> None:
         f.write("AoC 2025 - Day 4 Part 1 (Qiskit)\n")
         f.write(f"Answer: {answer}\n")
         f.write(f"Classical time: {classical_ms:.3f} ms\n")
+        f.write(f"NumPy time: {numpy_ms:.3f} ms\n")
         f.write(f"Simulator time (puzzle circuit): {sim_ms:.3f} ms\n")
         f.write(f"Top measurement results: {top}\n\n")
         f.write("Toy forklift-access puzzle circuit:\n")
@@ -1,8 +1,13 @@
+from collections import deque
 from pathlib import Path
+import sys
 import time
 
 from qiskit import QuantumCircuit, QuantumRegister, ClassicalRegister
-from qiskit_aer import AerSimulator
+
+# Shared helpers live in <repo>/common
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from common.execution import run_counts  # noqa: E402
 
 
 # ---------- Classical iterative-removal solver ----------
@@ -57,6 +62,54 @@ def solve_classical(text: str) -> int:
     return total_removed
 
 
+def solve_worklist(text: str) -> int:
+    """
+    Same total as solve_classical without rescanning the grid every round
+    (k-core style peeling): neighbour counts are computed once and a queue
+    holds the removable rolls. Removing a roll decrements its neighbours,
+    and a neighbour is queued when its count drops from 4 to 3, so every
+    cell is queued at most once and the work is O(h * w).
+
+    The set of removed rolls does not depend on the removal order, so the
+    total matches the round-by-round loop.
+    """
+    grid = parse_grid(text)
+    if not grid:
+        return 0
+
+    h = len(grid)
+    w = len(grid[0])
+    counts = [[0] * w for _ in range(h)]
+    queue = deque()
+
+    for y in range(h):
+        for x in range(w):
+            if grid[y][x] != "@":
+                continue
+            counts[y][x] = count_neighbors(grid, y, x)
+            if counts[y][x] < 4:
+                queue.append((y, x))
+
+    total_removed = 0
+    while queue:
+        y, x = queue.popleft()
+        grid[y][x] = "."
+        total_removed += 1
+
+        for dy in (-1, 0, 1):
+            for dx in (-1, 0, 1):
+                if dx == 0 and dy == 0:
+                    continue
+                ny = y + dy
+                nx = x + dx
+                if 0 <= ny < h and 0 <= nx < w and grid[ny][nx] == "@":
+                    counts[ny][nx] -= 1
+                    if counts[ny][nx] == 3:
+                        queue.append((ny, nx))
+
+    return total_removed
+
+
 # ---------- Toy iterative-removal puzzle circuit ----------
 
 def build_iterative_removal_puzzle_circuit() -> QuantumCircuit:
@@ -108,6 +161,15 @@ def main() -> None:
     print(answer)
     print(f"Classical time: {classical_ms:.3f} ms")
 
+    # Worklist (peeling) solve
+    t0 = time.perf_counter()
+    worklist_answer = solve_worklist(text)
+    t1 = time.perf_counter()
+    worklist_ms = (t1 - t0) * 1000.0
+
+    print(f"Worklist answer: {worklist_answer}")
+    print(f"Worklist time: {worklist_ms:.3f} ms")
+
     # Build toy iterative-removal circuit
     puzzle_circuit = build_iterative_removal_puzzle_circuit()
     puzzle_text = puzzle_circuit.draw(output="text")
@@ -115,14 +177,11 @@ def main() -> None:
     print(puzzle_text)
 
     # Run on simulator
-    sim = AerSimulator()
     t2 = time.perf_counter()
-    job = sim.run(puzzle_circuit, shots=1024)
-    result = job.result()
+    counts = run_counts(puzzle_circuit, shots=1024)
     t3 = time.perf_counter()
     sim_ms = (t3 - t2) * 1000.0
 
-    counts = result.get_counts()
     top = sorted(counts.items(), key=lambda kv: -kv[1])[:5]
     print("Top measurement results (puzzle circuit):", top)
     print(f"Simulator time: {sim_ms:.3f} ms")
@@ -133,6 +192,7 @@ def main() -> None:
         f.write("AoC 2025 - Day 4 Part 2 (Qiskit)\n")
         f.write(f"Answer: {answer}\n")
         f.write(f"Classical time: {classical_ms:.3f} ms\n")
+        f.write(f"Worklist time: {worklist_ms:.3f} ms\n")
         f.write(f"Simulator time (puzzle circuit): {sim_ms:.3f} ms\n")
         f.write(f"Top measurement results: {top}\n\n")
         f.write("Toy iterative-removal puzzle circuit:\n")
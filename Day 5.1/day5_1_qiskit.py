@@ -1,8 +1,12 @@
 from pathlib import Path
+import sys
 import time
 
 from qiskit import QuantumCircuit, QuantumRegister, ClassicalRegister
-from qiskit_aer import AerSimulator
+
+# Shared helpers live in <repo>/common
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from common.execution import run_counts  # noqa: E402
 
 
 # ---------- Classical solver ----------
@@ -101,14 +105,11 @@ def main() -> None:
     print(puzzle_text)
 
     # Run simulator
-    sim = AerSimulator()
     t2 = time.perf_counter()
-    job = sim.run(puzzle_circuit, shots=1024)
-    result = job.result()
+    counts = run_counts(puzzle_circuit, shots=1024)
     t3 = time.perf_counter()
     sim_ms = (t3 - t2) * 1000.0
 
-    counts = result.get_counts()
     top = sorted(counts.items(), key=lambda kv: -kv[1])[:5]
     print("Top measurement results (puzzle circuit):", top)
     print(f"Simulator time: {sim_ms:.3f} ms")
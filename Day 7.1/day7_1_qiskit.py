@@ -1,8 +1,12 @@
 from pathlib import Path
+import sys
 import time
 
 from qiskit import QuantumCircuit, QuantumRegister, ClassicalRegister
-from qiskit_aer import AerSimulator
+
+# Shared helpers live in <repo>/common
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from common.execution import run_counts  # noqa: E402
 
 
 # ----- Classical solver (same logic as Rust) -----
@@ -127,14 +131,11 @@ def main() -> None:
     print(circuit_text)
 
     # Simulate toy circuit
-    sim = AerSimulator()
     t2 = time.perf_counter()
-    job = sim.run(qc, shots=1024)
-    result = job.result()
+    counts = run_counts(qc, shots=1024)
     t3 = time.perf_counter()
     sim_ms = (t3 - t2) * 1000.0
 
-    counts = result.get_counts()
     top = sorted(counts.items(), key=lambda kv: -kv[1])[:5]
     print("Top measurement results (puzzle circuit):", top)
     print(f"Simulator time: {sim_ms:.3f} ms")
@@ -0,0 +1 @@
+"""Helpers shared between the Qiskit scripts of several days."""
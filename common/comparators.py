@@ -0,0 +1,87 @@
+"""
+Cheaper building blocks for the Day 2 comparator circuits, plus a cost report.
+
+The original comparators flip the flag with H + mcp(pi) + H over all
+mismatch bits. After transpilation that multi-controlled phase becomes a deep
+chain of rotations and CXs. append_and_tree() computes the same AND with a
+balanced tree of Toffolis into clean ancillas (a v-chain arranged as a tree):
+O(n) CX gates, O(log n) depth, and only X/CX/CCX, so common/execution.py can
+evaluate it without a simulator.
+"""
+import time
+from typing import Dict
+
+from qiskit import QuantumCircuit, transpile
+
+
+COST_BASIS = ["cx", "u"]
+
+
+def append_and_tree(qc: QuantumCircuit, controls, target, ancillas) -> None:
+    """
+    target ^= AND(controls), using len(controls) - 2 clean ancillas that are
+    returned to |0> afterwards.
+    """
+    controls = list(controls)
+    if not controls:
+        qc.x(target)
+        return
+    if len(controls) == 1:
+        qc.cx(controls[0], target)
+        return
+
+    free = list(ancillas)
+    if len(free) < len(controls) - 2:
+        raise ValueError(f"{len(controls)} controls need {len(controls) - 2} ancillas, got {len(free)}")
+
+    layer = controls
+    computed = []
+    while len(layer) > 2:
+        nxt = []
+        for i in range(0, len(layer) - 1, 2):
+            anc = free.pop(0)
+            qc.ccx(layer[i], layer[i + 1], anc)
+            computed.append((layer[i], layer[i + 1], anc))
+            nxt.append(anc)
+        if len(layer) % 2:
+            nxt.append(layer[-1])
+        layer = nxt
+
+    qc.ccx(layer[0], layer[1], target)
+
+    for a, b, anc in reversed(computed):
+        qc.ccx(a, b, anc)
+
+
+def circuit_cost(qc: QuantumCircuit, simulator=None, shots: int = 1024) -> Dict[str, float]:
+    """Depth and CX count after transpiling to CX + U, and Aer time for `shots` shots."""
+    if simulator is None:
+        from qiskit_aer import AerSimulator
+
+        simulator = AerSimulator()
+
+    lowered = transpile(qc, basis_gates=COST_BASIS, optimization_level=1)
+    t0 = time.perf_counter()
+    simulator.run(lowered, shots=shots).result()
+    sim_ms = (time.perf_counter() - t0) * 1000.0
+
+    return {
+        "qubits": qc.num_qubits,
+        "depth": lowered.depth(),
+        "cx": lowered.count_ops().get("cx", 0),
+        "sim_ms": sim_ms,
+    }
+
+
+def cost_report(variants: Dict[str, QuantumCircuit], simulator=None, shots: int = 1024) -> Dict[str, Dict[str, float]]:
+    return {name: circuit_cost(qc, simulator, shots) for name, qc in variants.items()}
+
+
+def format_cost_report(report: Dict[str, Dict[str, float]]) -> str:
+    width = max(len(name) for name in report)
+    lines = [f"{'variant':<{width}}  qubits  depth     cx   sim (ms)"]
+    for name, cost in report.items():
+        lines.append(
+            f"{name:<{width}}  {cost['qubits']:>6}  {cost['depth']:>5}  {cost['cx']:>5}  {cost['sim_ms']:>9.3f}"
+        )
+    return "\n".join(lines)
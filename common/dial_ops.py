@@ -0,0 +1,197 @@
+"""
+Precomputed dial rotations for the dense Day 1 circuits.
+
+Every rotation of the 100-position dial is a permutation of the 2^7 basis
+states (values 100..127 are left alone). All 200 of them, (R|L, dist mod 100),
+are kept in one small uint8 table of "destination" index arrays:
+
+    table[0, d] -> rotation R d
+    table[1, d] -> rotation L d
+
+Dense Operators are only built when a circuit actually needs one, through an
+LRU cache whose size can be changed with configure(). The table itself can be
+saved to / loaded from a .npy file so repeated runs skip building it.
+
+compress_rotations() merges runs of rotations into single net rotations, so
+the per-line dense circuits can be drawn and simulated with far fewer gates.
+"""
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Optional, Tuple
+
+import numpy as np
+
+from qiskit.quantum_info import Operator
+
+
+NUM_STATES = 100      # dial values 0..99
+NUM_QUBITS = 7        # 2^7 = 128 >= 100
+DIRECTIONS = ("R", "L")
+DEFAULT_OPERATOR_CACHE_SIZE = len(DIRECTIONS) * NUM_STATES   # all 200 rotations
+
+_table: Optional[np.ndarray] = None
+
+
+def build_permutation_table() -> np.ndarray:
+    """Build the (2, 100, 128) table of destination indices for every rotation."""
+    dim = 2**NUM_QUBITS
+    dists = np.arange(NUM_STATES)[:, None]
+    dials = np.arange(NUM_STATES)[None, :]
+
+    table = np.empty((len(DIRECTIONS), NUM_STATES, dim), dtype=np.uint8)
+    table[:, :, NUM_STATES:] = np.arange(NUM_STATES, dim)
+    table[0, :, :NUM_STATES] = (dials + dists) % NUM_STATES
+    table[1, :, :NUM_STATES] = (dials - dists) % NUM_STATES
+    return table
+
+
+def permutation_table(cache_path: Optional[Path] = None) -> np.ndarray:
+    """
+    Return the shared permutation table, building it once per process.
+
+    With `cache_path`, the table is loaded from that .npy file if it exists and
+    written there after building otherwise.
+    """
+    global _table
+    if _table is None:
+        if cache_path is not None and Path(cache_path).exists():
+            table = np.load(cache_path)
+            if table.shape != (len(DIRECTIONS), NUM_STATES, 2**NUM_QUBITS):
+                raise ValueError(f"Unexpected dial table shape {table.shape} in {cache_path}")
+        else:
+            table = build_permutation_table()
+        table.setflags(write=False)
+        _table = table
+
+    if cache_path is not None and not Path(cache_path).exists():
+        np.save(cache_path, _table)
+    return _table
+
+
+def _direction_index(direction: str) -> int:
+    try:
+        return DIRECTIONS.index(direction)
+    except ValueError:
+        raise ValueError(f"Invalid direction {direction!r}") from None
+
+
+def rotation_permutation(direction: str, dist: int) -> np.ndarray:
+    """dest[basis] = basis state that |basis> is mapped to by the rotation."""
+    return permutation_table()[_direction_index(direction), dist % NUM_STATES]
+
+
+def inverse_permutation(direction: str, dist: int) -> np.ndarray:
+    """src[basis] = basis state mapped onto |basis>; usable as a gather index."""
+    other = "L" if _direction_index(direction) == 0 else "R"
+    return rotation_permutation(other, dist)
+
+
+def net_rotation(net: int, num_states: int = NUM_STATES) -> Tuple[str, int]:
+    """Express a net dial offset (mod num_states) as the shorter single rotation."""
+    net %= num_states
+    if net <= num_states // 2:
+        return "R", net
+    return "L", num_states - net
+
+
+def compress_rotations(
+    rotations,
+    window: Optional[int] = None,
+    start: int = 50,
+    isolate: Optional[Callable[[int, str, int], bool]] = None,
+    num_states: int = NUM_STATES,
+):
+    """
+    Merge runs of consecutive rotations into a single net rotation mod
+    num_states (the dial size; only the dense gates are tied to 100).
+
+    The dial register only shows where the dial is after each gate, so a run
+    is closed whenever the dial lands on 0 (Day 1.1 hits keep their own step)
+    and, if `window` is given, after at most `window` original rotations.
+
+    isolate(pos, direction, dist) marks steps that must stay a gate of their
+    own, e.g. Day 1.2 rotations that pass through 0 on the way: the current
+    run is closed before such a step and the step is emitted unchanged. The
+    merged runs then keep their exact signed offset instead of the shorter
+    rotation, which could pass through 0 where the original steps did not.
+    """
+    if window is not None and window < 1:
+        raise ValueError(f"window must be >= 1, got {window}")
+
+    def close(net: int) -> Tuple[str, int]:
+        if isolate is None:
+            return net_rotation(net, num_states)
+        return ("R", net) if net >= 0 else ("L", -net)
+
+    compressed = []
+    pos = start % num_states
+    net = 0
+    run_len = 0
+
+    for direction, dist in rotations:
+        if direction == "R":
+            step = dist
+        elif direction == "L":
+            step = -dist
+        else:
+            raise ValueError(f"Invalid direction {direction!r}")
+
+        if isolate is not None and isolate(pos, direction, dist):
+            if run_len:
+                compressed.append(close(net))
+                net = 0
+                run_len = 0
+            compressed.append((direction, dist))
+            pos = (pos + step) % num_states
+            continue
+
+        pos = (pos + step) % num_states
+        net += step
+        run_len += 1
+
+        if pos == 0 or (window is not None and run_len >= window):
+            compressed.append(close(net))
+            net = 0
+            run_len = 0
+
+    if run_len:
+        compressed.append(close(net))
+
+    return compressed
+
+
+def _build_rotation_operator(direction: str, dist: int) -> Operator:
+    dest = rotation_permutation(direction, dist)
+    dim = dest.size
+    mat = np.zeros((dim, dim), dtype=complex)
+    mat[dest, np.arange(dim)] = 1.0
+    return Operator(mat)
+
+
+_operator_cache = lru_cache(maxsize=DEFAULT_OPERATOR_CACHE_SIZE)(_build_rotation_operator)
+
+
+def make_rotation_unitary(direction: str, dist: int) -> Operator:
+    """
+    2^7 x 2^7 permutation unitary for a single rotation:
+      - For states 0..99: add/subtract dist modulo 100
+      - For states 100..127: leave unchanged
+    Operators are shared through an LRU cache (see configure()).
+    """
+    _direction_index(direction)
+    return _operator_cache(direction, dist % NUM_STATES)
+
+
+def configure(
+    cache_size: Optional[int] = DEFAULT_OPERATOR_CACHE_SIZE,
+    cache_path: Optional[Path] = None,
+) -> None:
+    """
+    cache_size: max number of dense Operators kept alive (None = unbounded);
+                the current Operator cache is dropped.
+    cache_path: .npy file used to load/save the permutation table.
+    """
+    global _operator_cache
+    _operator_cache = lru_cache(maxsize=cache_size)(_build_rotation_operator)
+    if cache_path is not None:
+        permutation_table(cache_path)
@@ -0,0 +1,101 @@
+"""
+One entry point for running the puzzle circuits.
+
+Most of the circuits in this repo start from |0...0> and only use X, CX, CCX
+(and friends) before measuring. Such a circuit maps one basis state to another,
+so every shot gives the same bitstring. run_counts() detects that case and
+evaluates the circuit bit by bit instead of starting AerSimulator. Anything
+with H, phase or other non-classical gates still goes to Aer.
+
+The returned counts use the same format as Result.get_counts(): classical
+registers in reverse order of creation, separated by spaces, MSB first.
+"""
+from typing import Dict
+
+from qiskit import QuantumCircuit
+
+
+# Gates that permute computational basis states (all controls on |1> unless
+# ctrl_state says otherwise, which is handled below).
+CLASSICAL_GATES = {"x", "cx", "ccx", "mcx", "swap", "cswap", "id", "reset"}
+IGNORED_OPS = {"barrier", "delay"}
+
+
+def is_classical_circuit(qc: QuantumCircuit) -> bool:
+    """True if `qc` can be evaluated exactly with the bit-level evaluator."""
+    if sum(len(reg) for reg in qc.cregs) != qc.num_clbits:
+        return False  # loose clbits: leave the formatting to Aer
+
+    measured = False
+    for inst in qc.data:
+        name = inst.operation.name
+        if name == "measure":
+            measured = True
+            continue
+        if name in IGNORED_OPS:
+            continue
+        if name not in CLASSICAL_GATES:
+            return False
+        if getattr(inst.operation, "condition", None) is not None:
+            return False
+    return measured
+
+
+def evaluate_classical(qc: QuantumCircuit) -> str:
+    """Run a classical circuit on |0...0> and return its measured bitstring."""
+    qubits = 0
+    clbits = 0
+
+    def bit(i: int) -> int:
+        return (qubits >> i) & 1
+
+    for inst in qc.data:
+        op = inst.operation
+        name = op.name
+        q = [qc.find_bit(qb).index for qb in inst.qubits]
+
+        if name == "measure":
+            c = qc.find_bit(inst.clbits[0]).index
+            clbits = (clbits & ~(1 << c)) | (bit(q[0]) << c)
+        elif name == "reset":
+            qubits &= ~(1 << q[0])
+        elif name == "swap":
+            if bit(q[0]) != bit(q[1]):
+                qubits ^= (1 << q[0]) | (1 << q[1])
+        elif name == "cswap":
+            if bit(q[0]) and bit(q[1]) != bit(q[2]):
+                qubits ^= (1 << q[1]) | (1 << q[2])
+        elif name in ("x", "cx", "ccx", "mcx"):
+            controls = q[:-1]
+            ctrl_state = getattr(op, "ctrl_state", (1 << len(controls)) - 1)
+            if all(bit(ctl) == (ctrl_state >> k) & 1 for k, ctl in enumerate(controls)):
+                qubits ^= 1 << q[-1]
+        # "id", barriers and delays leave the state alone
+
+    parts = []
+    for reg in reversed(qc.cregs):
+        value = "".join(
+            str((clbits >> qc.find_bit(cb).index) & 1) for cb in reversed(reg)
+        )
+        parts.append(value)
+    return " ".join(parts)
+
+
+def run_counts(
+    qc: QuantumCircuit,
+    shots: int = 1024,
+    simulator=None,
+) -> Dict[str, int]:
+    """
+    Counts for `qc`: computed analytically for classical reversible circuits,
+    otherwise from `simulator` (a fresh AerSimulator if none is given).
+    """
+    if is_classical_circuit(qc):
+        return {evaluate_classical(qc): shots}
+
+    if simulator is None:
+        from qiskit_aer import AerSimulator
+
+        simulator = AerSimulator()
+    return simulator.run(qc, shots=shots).result().get_counts()
+
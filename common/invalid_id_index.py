@@ -0,0 +1,122 @@
+"""
+On-disk index of every Day 2 invalid ID up to a given number of digits.
+
+For one rule ("halves" = Day 2.1, "repeats" = Day 2.2) the index is two .npy
+files in a directory:
+
+    <rule>_<digits>_ids.npy     sorted invalid IDs (uint64)
+    <rule>_<digits>_cumsum.npy  cumsum[i] = sum of the first i IDs (uint64)
+
+Files are opened with mmap_mode="r", so any number of processes share the
+same pages, and a range query is two binary searches and one subtraction.
+Each file is written to a temporary name and renamed into place (cumsum
+first, ids last), so a process that finds both files never maps a partly
+written one, even while another process is still building the index.
+"""
+import os
+from pathlib import Path
+import tempfile
+
+import numpy as np
+
+
+RULES = ("halves", "repeats")
+MAX_INDEX_DIGITS = 12   # keeps the cumulative sums well inside uint64
+
+
+def _block_ids(length: int, block_len: int) -> np.ndarray:
+    """All `length`-digit numbers made of one `block_len`-digit block repeated."""
+    mult = (10**length - 1) // (10**block_len - 1)
+    blocks = np.arange(10 ** (block_len - 1), 10**block_len, dtype=np.uint64)
+    return blocks * np.uint64(mult)
+
+
+def generate_invalid_ids(rule: str, max_digits: int) -> np.ndarray:
+    """Sorted invalid IDs with at most `max_digits` digits for `rule`."""
+    if rule not in RULES:
+        raise ValueError(f"Unknown rule {rule!r}, expected one of {RULES}")
+    if not 1 <= max_digits <= MAX_INDEX_DIGITS:
+        raise ValueError(f"max_digits must be in 1..{MAX_INDEX_DIGITS}, got {max_digits}")
+
+    parts = [np.zeros(0, dtype=np.uint64)]
+    for length in range(2, max_digits + 1):
+        if rule == "halves":
+            if length % 2 == 0:
+                parts.append(_block_ids(length, length // 2))
+            continue
+        for block_len in range(1, length):
+            if length % block_len == 0:
+                parts.append(_block_ids(length, block_len))
+
+    # np.unique sorts and removes IDs with several block lengths (111111)
+    return np.unique(np.concatenate(parts))
+
+
+def index_paths(directory: Path, rule: str, max_digits: int) -> tuple[Path, Path]:
+    directory = Path(directory)
+    stem = f"{rule}_{max_digits}"
+    return directory / f"{stem}_ids.npy", directory / f"{stem}_cumsum.npy"
+
+
+def _save_atomic(path: Path, array: np.ndarray) -> None:
+    """np.save to a temporary file in the same directory, then os.replace."""
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.stem}.", suffix=".npy")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.save(f, array)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def build_index(directory: Path, rule: str, max_digits: int = 10) -> tuple[Path, Path]:
+    """Generate the IDs for `rule` and write the index files into `directory`."""
+    ids = generate_invalid_ids(rule, max_digits)
+    cumsum = np.zeros(ids.size + 1, dtype=np.uint64)
+    np.cumsum(ids, out=cumsum[1:])
+
+    ids_path, cumsum_path = index_paths(directory, rule, max_digits)
+    ids_path.parent.mkdir(parents=True, exist_ok=True)
+    # ids last: InvalidIdIndex treats an existing ids file as a complete index
+    _save_atomic(cumsum_path, cumsum)
+    _save_atomic(ids_path, ids)
+    return ids_path, cumsum_path
+
+
+class InvalidIdIndex:
+    """Read-only, memory-mapped view of an index built by build_index()."""
+
+    def __init__(self, directory: Path, rule: str, max_digits: int = 10, build: bool = True):
+        ids_path, cumsum_path = index_paths(directory, rule, max_digits)
+        if not (ids_path.exists() and cumsum_path.exists()):
+            if not build:
+                raise FileNotFoundError(f"No {rule!r} index with {max_digits} digits in {directory}")
+            build_index(directory, rule, max_digits)
+
+        self.rule = rule
+        self.max_digits = max_digits
+        self.ids = np.load(ids_path, mmap_mode="r")
+        self.cumsum = np.load(cumsum_path, mmap_mode="r")
+
+    def range_sum(self, start: int, end: int) -> int:
+        """Sum of the invalid IDs in [start, end]."""
+        if end >= 10**self.max_digits:
+            raise ValueError(f"{end} has more than {self.max_digits} digits; rebuild the index")
+        if start > end:
+            return 0
+        start = max(start, 0)
+        lo = int(np.searchsorted(self.ids, np.uint64(start), side="left"))
+        hi = int(np.searchsorted(self.ids, np.uint64(end), side="right"))
+        return int(self.cumsum[hi]) - int(self.cumsum[lo])
+
+    def solve(self, text: str) -> int:
+        """Day 2 answer for a comma-separated list of ranges."""
+        total = 0
+        for token in text.strip().split(","):
+            token = token.strip()
+            if not token:
+                continue
+            start_s, end_s = token.split("-")
+            total += self.range_sum(int(start_s), int(end_s))
+        return total
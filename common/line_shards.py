@@ -0,0 +1,75 @@
+"""
+Line-by-line puzzle inputs (Day 3 banks) solved on every core.
+
+The input file is memory-mapped once to find newline-aligned shard
+boundaries, so no line is ever split between two shards. Each worker then
+maps the same file itself and decodes only the bytes of its own shard; the
+pages are shared through the OS page cache instead of pickling the whole
+text into every process. Per-shard totals are summed.
+
+`line_fn` is any picklable str -> int function applied to every non-empty
+line, e.g. `max_joltage_for_bank` (Day 3.1) or `max_joltage_12` (Day 3.2).
+"""
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+import mmap
+import os
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+Shard = Tuple[int, int]
+
+
+def shard_offsets(buf, num_shards: int) -> List[Shard]:
+    """Split `buf` into at most `num_shards` (start, end) byte ranges ending on a newline."""
+    size = len(buf)
+    step = max(1, -(-size // max(1, num_shards)))
+
+    shards: List[Shard] = []
+    start = 0
+    while start < size:
+        cut = buf.find(b"\n", min(size, start + step) - 1)
+        end = size if cut < 0 else cut + 1
+        shards.append((start, end))
+        start = end
+    return shards
+
+
+def sum_lines(data: bytes, line_fn: Callable[[str], int]) -> int:
+    total = 0
+    for line in data.decode("ascii").splitlines():
+        line = line.strip()
+        if line:
+            total += line_fn(line)
+    return total
+
+
+def scan_shard(path: str, shard: Shard, line_fn: Callable[[str], int]) -> int:
+    """Worker: map `path` and sum line_fn over the lines in bytes [start, end)."""
+    start, end = shard
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return sum_lines(mm[start:end], line_fn)
+
+
+def solve_sharded(
+    path,
+    line_fn: Callable[[str], int],
+    workers: Optional[int] = None,
+    shards_per_worker: int = 4,
+) -> int:
+    """Sum of line_fn over the non-empty lines of the file at `path`, on a process pool."""
+    path = str(Path(path).resolve())
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    with open(path, "rb") as f:
+        if f.seek(0, 2) == 0:
+            return 0  # mmap refuses empty files
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            shards = shard_offsets(mm, workers * shards_per_worker)
+
+    if workers == 1:
+        return sum(scan_shard(path, shard, line_fn) for shard in shards)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return sum(pool.map(scan_shard, repeat(path), shards, repeat(line_fn)))
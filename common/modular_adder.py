@@ -0,0 +1,143 @@
+"""
+Gate-level dial rotations: "add/subtract d mod N" as a reversible circuit.
+
+The dense dial circuits use one 2^n x 2^n permutation unitary per rotation,
+which grows as 4^n. Here every rotation is a constant modular adder built from
+H, phase, controlled-phase, X and CX gates:
+
+  - Draper adder: adding a constant is a set of single-qubit phases once the
+    register is in the Fourier basis.
+  - Beauregard reduction: add a, subtract N, copy the sign bit into an
+    ancilla, add N back if the result went negative, then uncompute the ancilla.
+
+The register keeps one extra (overflow) qubit, so a dial with N states needs
+ceil(log2 N) + 2 qubits, and the number of gates grows polynomially with the
+register size instead of exponentially.
+"""
+from typing import Optional
+
+import numpy as np
+
+from qiskit import QuantumCircuit, QuantumRegister, ClassicalRegister
+
+
+def dial_bits(num_states: int) -> int:
+    """Number of bits needed to hold the dial values 0..num_states-1."""
+    if num_states < 2:
+        raise ValueError(f"num_states must be >= 2, got {num_states}")
+    return (num_states - 1).bit_length()
+
+
+def qft(qc: QuantumCircuit, qubits) -> None:
+    """QFT without the final swaps: qubit j ends up holding phase 2*pi*x / 2^(j+1)."""
+    m = len(qubits)
+    for j in reversed(range(m)):
+        qc.h(qubits[j])
+        for k in reversed(range(j)):
+            qc.cp(np.pi / 2 ** (j - k), qubits[k], qubits[j])
+
+
+def iqft(qc: QuantumCircuit, qubits) -> None:
+    """Inverse of qft()."""
+    m = len(qubits)
+    for j in range(m):
+        for k in range(j):
+            qc.cp(-np.pi / 2 ** (j - k), qubits[k], qubits[j])
+        qc.h(qubits[j])
+
+
+def phase_add(qc: QuantumCircuit, qubits, value: int, control=None) -> None:
+    """
+    Add `value` mod 2^len(qubits) to a register that is in the Fourier basis
+    (see qft). With `control`, the addition only happens if that qubit is |1>.
+    """
+    m = len(qubits)
+    value %= 2**m
+    for j in range(m):
+        angle = 2 * np.pi * value / 2 ** (j + 1)
+        angle = (angle + np.pi) % (2 * np.pi) - np.pi
+        if np.isclose(angle, 0.0):
+            continue
+        if control is None:
+            qc.p(angle, qubits[j])
+        else:
+            qc.cp(angle, control, qubits[j])
+
+
+def modular_phase_add(qc: QuantumCircuit, qubits, anc, value: int, num_states: int) -> None:
+    """
+    Beauregard's constant adder: |b> -> |(b + value) mod num_states> for b < num_states.
+
+    `qubits` must be in the Fourier basis on entry and is left there on exit;
+    the top qubit of `qubits` is the overflow/sign bit and `anc` is returned to |0>.
+    """
+    value %= num_states
+    if value == 0:
+        return
+
+    msb = qubits[-1]
+
+    phase_add(qc, qubits, value)
+    phase_add(qc, qubits, -num_states)
+
+    # b + value - N < 0  <=>  sign bit set: remember it in the ancilla
+    iqft(qc, qubits)
+    qc.cx(msb, anc)
+    qft(qc, qubits)
+    phase_add(qc, qubits, num_states, control=anc)
+
+    # Uncompute the ancilla: (b + value) mod N >= value  <=>  no wrap-around happened
+    phase_add(qc, qubits, -value)
+    iqft(qc, qubits)
+    qc.x(msb)
+    qc.cx(msb, anc)
+    qc.x(msb)
+    qft(qc, qubits)
+    phase_add(qc, qubits, value)
+
+
+def build_modular_dial_circuit(
+    rotations,
+    num_states: int = 100,
+    start: Optional[int] = 50,
+    measure: bool = True,
+) -> QuantumCircuit:
+    """
+    Build the dial process out of modular-adder gates instead of dense unitaries.
+
+    rotations: (direction, dist) pairs as returned by parse_rotations.
+    start:     initial dial value prepared with X gates (None leaves |0...0>).
+    measure:   measure the dial bits into a classical register "c".
+
+    The register stays in the Fourier basis between rotations, so there is a
+    single QFT at the beginning and a single inverse QFT at the end.
+    """
+    n = dial_bits(num_states)
+    dial = QuantumRegister(n + 1, "dial")
+    anc = QuantumRegister(1, "anc")
+    qc = QuantumCircuit(dial, anc, name="dial_adder")
+
+    if start is not None:
+        start %= num_states
+        for i in range(n):
+            if (start >> i) & 1:
+                qc.x(dial[i])
+
+    qft(qc, dial)
+    for direction, dist in rotations:
+        if direction == "R":
+            value = dist
+        elif direction == "L":
+            value = -dist
+        else:
+            raise ValueError(f"Invalid direction {direction!r}")
+        modular_phase_add(qc, dial, anc[0], value, num_states)
+    iqft(qc, dial)
+
+    if measure:
+        c = ClassicalRegister(n, "c")
+        qc.add_register(c)
+        for i in range(n):
+            qc.measure(dial[i], c[i])
+
+    return qc
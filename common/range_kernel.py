@@ -0,0 +1,102 @@
+"""
+Vectorized scanning of Day 2 style ID ranges.
+
+Instead of calling a Python predicate with str(n) for every integer, a range
+is walked in fixed-size int64 blocks (np.arange) and the predicate works on a
+whole block at once using digit arithmetic:
+
+  - "block A repeated" IDs of length L with block length b are exactly the
+    L-digit multiples of the repunit-style multiplier (10^L - 1) / (10^b - 1),
+  - blocks are ascending, so the values with L digits are one contiguous
+    slice, found by a binary search for 10^(L-1) and 10^L; any other array
+    falls back to comparing the digit length of every value.
+
+A predicate takes an int64 array and returns a boolean mask of the same shape.
+"""
+from typing import Callable
+
+import numpy as np
+
+
+POW10 = 10 ** np.arange(19, dtype=np.int64)       # 1, 10, ..., 10^18
+MAX_VALUE = int(np.iinfo(np.int64).max)
+DEFAULT_BLOCK_SIZE = 1 << 20
+
+Predicate = Callable[[np.ndarray], np.ndarray]
+
+
+def digit_lengths(values: np.ndarray) -> np.ndarray:
+    """Number of decimal digits of each (non-negative) value; 0 has one digit."""
+    return np.maximum(np.searchsorted(POW10, values, side="right"), 1)
+
+
+def repeat_multiplier(length: int, block_len: int) -> int:
+    """Multiplier that repeats a block_len-digit block up to `length` digits."""
+    return (10**length - 1) // (10**block_len - 1)
+
+
+def block_repeat_mask(values: np.ndarray, lengths: np.ndarray, length: int, block_len: int) -> np.ndarray:
+    """Mask of the `length`-digit values made of one block_len-digit block repeated."""
+    return (lengths == length) & (values % repeat_multiplier(length, block_len) == 0)
+
+
+def _is_ascending(values: np.ndarray) -> bool:
+    return values.ndim == 1 and bool(np.all(values[1:] >= values[:-1]))
+
+
+def _length_bands(values: np.ndarray):
+    """Yield (length, lo, hi) so that values[lo:hi] are the `length`-digit entries of an ascending array."""
+    if values.size == 0:
+        return
+    first = int(digit_lengths(values[:1])[0])
+    last = int(digit_lengths(values[-1:])[0])
+    for length in range(first, last + 1):
+        lo = 0 if length == first else int(np.searchsorted(values, POW10[length - 1]))
+        hi = values.size if length == last else int(np.searchsorted(values, POW10[length]))
+        yield length, lo, hi
+
+
+def _repeat_mask(values: np.ndarray, block_lens: Callable[[int], list]) -> np.ndarray:
+    """Values that are some block_lens(length) block repeated, for any order of `values`."""
+    mask = np.zeros(values.shape, dtype=bool)
+    if _is_ascending(values):
+        for length, lo, hi in _length_bands(values):
+            band = values[lo:hi]
+            for block_len in block_lens(length):
+                mask[lo:hi] |= band % repeat_multiplier(length, block_len) == 0
+        return mask
+
+    lengths = digit_lengths(values)
+    for length in np.flatnonzero(np.bincount(lengths.ravel(), minlength=1)).tolist():
+        for block_len in block_lens(length):
+            mask |= block_repeat_mask(values, lengths, length, block_len)
+    return mask
+
+
+def equal_halves_mask(values: np.ndarray) -> np.ndarray:
+    """Day 2.1 rule: even length 2k and divisible by 10^k + 1."""
+    return _repeat_mask(values, lambda length: [length // 2] if length % 2 == 0 else [])
+
+
+def repeated_block_mask(values: np.ndarray) -> np.ndarray:
+    """Day 2.2 rule: some block length b < L with b | L and divisible by the repunit multiplier."""
+    return _repeat_mask(values, lambda length: [b for b in range(1, length) if length % b == 0])
+
+
+def sum_matching_in_range(start: int, end: int, predicate: Predicate, block_size: int = DEFAULT_BLOCK_SIZE) -> int:
+    """Sum of the values in [start, end] selected by `predicate`, one int64 block at a time."""
+    if start < 0 or end >= MAX_VALUE:
+        raise ValueError(f"range {start}-{end} does not fit in int64")
+
+    total = 0
+    for lo in range(start, end + 1, block_size):
+        hi = min(end, lo + block_size - 1)
+        values = np.arange(lo, hi + 1, dtype=np.int64)
+        selected = values[predicate(values)]
+        # Python ints for the sum: a few matches near 10^18 would overflow int64
+        total += sum(selected.tolist())
+    return total
+
+
+def sum_matching(ranges, predicate: Predicate, block_size: int = DEFAULT_BLOCK_SIZE) -> int:
+    return sum(sum_matching_in_range(start, end, predicate, block_size) for start, end in ranges)